@@ -1,5 +1,12 @@
+import csv
+import json
+import math
+import time
+import weakref
+from array import array
 from dataclasses import dataclass
-from typing import Callable, Iterable, List
+from itertools import groupby, islice
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, TextIO, Tuple, Union
 
 # --- SRP: Cart handles items and totals only ---
 @dataclass(frozen=True)
@@ -7,6 +14,7 @@ class Product:
     sku: str
     name: str
     price_cents: int
+    category: str = ""
 
 @dataclass
 class CartItem:
@@ -14,37 +22,173 @@ class CartItem:
     qty: int
 
 class Cart:
+    """Lines are indexed by SKU and the subtotal is kept up to date on every change."""
     def __init__(self) -> None:
-        self._items: List[CartItem] = []
+        self._items: Dict[str, CartItem] = {}
+        self._subtotal_cents = 0
+        self.version = 0  # bumped on every change so derived results can be cached
 
     def add(self, product: Product, qty: int = 1) -> None:
         assert qty > 0
-        self._items.append(CartItem(product, qty))
+        item = self._items.get(product.sku)
+        if item is None:
+            self._items[product.sku] = CartItem(product, qty)
+        else:
+            assert item.product == product, f"SKU {product.sku} already in cart with different product data"
+            item.qty += qty
+        self._subtotal_cents += product.price_cents * qty
+        self.version += 1
+
+    def remove(self, sku: str, qty: Optional[int] = None) -> None:
+        item = self._items[sku]
+        if qty is None or qty >= item.qty:
+            qty = item.qty
+            del self._items[sku]
+        else:
+            assert qty > 0
+            item.qty -= qty
+        self._subtotal_cents -= item.product.price_cents * qty
+        self.version += 1
+
+    def get(self, sku: str) -> Optional[CartItem]:
+        return self._items.get(sku)
+
+    def qty_of(self, sku: str) -> int:
+        item = self._items.get(sku)
+        return item.qty if item else 0
 
     @property
     def subtotal_cents(self) -> int:
-        return sum(i.product.price_cents * i.qty for i in self._items)
+        return self._subtotal_cents
 
     @property
     def items(self) -> Iterable[CartItem]:
-        return tuple(self._items)
+        return tuple(self._items.values())
+
+    def __len__(self) -> int:
+        return len(self._items)
 
 # --- OCP: Pricing rules are pluggable callables ---
 PricingRule = Callable[[Cart], int]
 
+# Declarative rules: each is a plain callable, but PricingPlan can also fuse them into one pass.
+@dataclass(frozen=True)
+class PctOffOver:
+    threshold_cents: int
+    percent: float
+
+    def on_total(self, subtotal: int) -> int:
+        return int(subtotal * self.percent) if subtotal >= self.threshold_cents else 0
+
+    def __call__(self, cart: Cart) -> int:
+        return self.on_total(cart.subtotal_cents)
+
+    @property
+    def spec(self) -> tuple:
+        return ("pct_off_over", self.threshold_cents, self.percent)
+
+@dataclass(frozen=True)
+class BuyNGetMFree:
+    sku: str
+    n: int
+    m: int
+
+    def on_line(self, ci: CartItem) -> int:
+        groups = ci.qty // (self.n + self.m)
+        return groups * self.m * ci.product.price_cents
+
+    def __call__(self, cart: Cart) -> int:
+        ci = cart.get(self.sku)
+        return self.on_line(ci) if ci else 0
+
+    @property
+    def spec(self) -> tuple:
+        return ("buy_n_get_m_free", self.sku, self.n, self.m)
+
+@dataclass(frozen=True)
+class SkuPctOff:
+    sku: str
+    percent: float
+
+    def on_line(self, ci: CartItem) -> int:
+        return int(ci.product.price_cents * ci.qty * self.percent)
+
+    def __call__(self, cart: Cart) -> int:
+        ci = cart.get(self.sku)
+        return self.on_line(ci) if ci else 0
+
+    @property
+    def spec(self) -> tuple:
+        return ("sku_pct_off", self.sku, self.percent)
+
+@dataclass(frozen=True)
+class CategoryPctOff:
+    category: str
+    percent: float
+
+    def on_total(self, category_subtotal: int) -> int:
+        return int(category_subtotal * self.percent)
+
+    def __call__(self, cart: Cart) -> int:
+        return self.on_total(sum(ci.product.price_cents * ci.qty for ci in cart.items
+                                 if ci.product.category == self.category))
+
+    @property
+    def spec(self) -> tuple:
+        return ("category_pct_off", self.category, self.percent)
+
+class PricingPlan:
+    """Rules compiled into one pass over the cart lines, memoized per cart version.
+
+    Opaque callables are still supported; they are assumed to depend only on the cart.
+    """
+    def __init__(self, rules: Iterable[PricingRule]):
+        self._on_total: List[PctOffOver] = []
+        self._by_sku: Dict[str, List[PricingRule]] = {}
+        self._by_category: Dict[str, List[CategoryPctOff]] = {}
+        self._opaque: List[PricingRule] = []
+        for r in rules:
+            if isinstance(r, PctOffOver):
+                self._on_total.append(r)
+            elif isinstance(r, (BuyNGetMFree, SkuPctOff)):
+                self._by_sku.setdefault(r.sku, []).append(r)
+            elif isinstance(r, CategoryPctOff):
+                self._by_category.setdefault(r.category, []).append(r)
+            else:
+                self._opaque.append(r)
+        self._cache: "weakref.WeakKeyDictionary[Cart, Tuple[int, int]]" = weakref.WeakKeyDictionary()
+
+    def __call__(self, cart: Cart) -> int:
+        cached = self._cache.get(cart)
+        if cached is not None and cached[0] == cart.version:
+            return cached[1]
+        discount = self._evaluate(cart)
+        self._cache[cart] = (cart.version, discount)
+        return discount
+
+    def _evaluate(self, cart: Cart) -> int:
+        subtotal = cart.subtotal_cents
+        discount = sum(r.on_total(subtotal) for r in self._on_total)
+        if self._by_sku or self._by_category:
+            by_sku, by_category = self._by_sku, self._by_category
+            category_totals = dict.fromkeys(by_category, 0)
+            for ci in cart.items:
+                for r in by_sku.get(ci.product.sku, ()):
+                    discount += r.on_line(ci)
+                if ci.product.category in category_totals:
+                    category_totals[ci.product.category] += ci.product.price_cents * ci.qty
+            for category, total in category_totals.items():
+                discount += sum(r.on_total(total) for r in by_category[category])
+        return discount + sum(r(cart) for r in self._opaque)
+
+def compile_rules(rules: Iterable[PricingRule]) -> PricingPlan:
+    return PricingPlan(rules)
+
 def pct_off_over(threshold_cents: int, percent: float) -> PricingRule:
-    def rule(cart: Cart) -> int:
-        return int(cart.subtotal_cents * percent) if cart.subtotal_cents >= threshold_cents else 0
-    return rule
+    return PctOffOver(threshold_cents, percent)
 
 def buy_n_get_m_free(sku: str, n: int, m: int) -> PricingRule:
-    def rule(cart: Cart) -> int:
-        for ci in cart.items:
-            if ci.product.sku == sku:
-                groups = ci.qty // (n + m)
-                return groups * m * ci.product.price_cents
-        return 0
-    return rule
+    return BuyNGetMFree(sku, n, m)
 
 # --- DIP: OrderService depends on abstractions (callables) ---
 ChargeFn = Callable[[int], str]
@@ -52,14 +196,30 @@ ChargeFn = Callable[[int], str]
 class OrderService:
     def __init__(self, charge: ChargeFn, pricing_rules: Iterable[PricingRule]):
         self.charge = charge
-        self.rules = list(pricing_rules)
+        self.rules = pricing_rules
 
-    def checkout(self, cart: Cart) -> str:
+    @property
+    def rules(self) -> Tuple[PricingRule, ...]:
+        return self._rules
+
+    @rules.setter
+    def rules(self, pricing_rules: Iterable[PricingRule]) -> None:
+        # the plan is compiled once per rule set, so rules can only be replaced as a whole
+        self._rules = tuple(pricing_rules)
+        self.plan = compile_rules(self._rules)
+
+    def price(self, cart: Cart) -> Tuple[int, int, int]:
         subtotal = cart.subtotal_cents
-        discount = sum(r(cart) for r in self.rules)
-        total = max(subtotal - discount, 0)
+        discount = self.plan(cart)
+        return subtotal, discount, max(subtotal - discount, 0)
+
+    def checkout(self, cart: Cart) -> str:
+        subtotal, discount, total = self.price(cart)
         txn_id = self.charge(total)
-        return f"Subtotal: ${subtotal/100:.2f}\nDiscount: -${discount/100:.2f}\nTOTAL: ${total/100:.2f}\nTransaction: {txn_id}"
+        return format_receipt(subtotal, discount, total, txn_id)
+
+def format_receipt(subtotal: int, discount: int, total: int, txn_id: str) -> str:
+    return f"Subtotal: ${subtotal/100:.2f}\nDiscount: -${discount/100:.2f}\nTOTAL: ${total/100:.2f}\nTransaction: {txn_id}"
 
 # --- Concrete dependencies ---
 def stripe_charge(amount_cents: int) -> str:
@@ -70,14 +230,168 @@ def paypal_charge(amount_cents: int) -> str:
     if amount_cents <= 0: raise ValueError("Amount must be positive")
     return f"paypal_txn_{amount_cents}"
 
+# --- Bulk checkout: stream carts from a dump, check out in bounded chunks ---
+class CartParseError(ValueError):
+    """A cart in a dump that could not be read (unknown SKU, bad quantity, malformed row)."""
+
+def _parse_error(e: Exception) -> CartParseError:
+    if isinstance(e, KeyError):
+        return CartParseError(f"unknown SKU {e.args[0]!r}")
+    return CartParseError(str(e) or type(e).__name__)
+
+def _quantity(raw) -> int:
+    qty = int(raw)
+    if qty <= 0:
+        raise ValueError(f"quantity must be positive, got {qty}")
+    return qty
+
+def read_carts(path: str, catalog: Mapping[str, Product]) -> Iterator[Tuple[str, Union[Cart, CartParseError]]]:
+    """Yields (cart_id, cart) pairs one at a time.
+
+    CSV rows are `cart_id,sku,qty` with the lines of a cart on consecutive rows;
+    JSONL lines are `{"cart_id": ..., "items": [{"sku": ..., "qty": ...}, ...]}`.
+    A cart that cannot be read is yielded as a CartParseError instead, and reading goes on.
+    """
+    with open(path, newline="") as f:
+        if path.endswith(".jsonl"):
+            for line_no, raw in enumerate(f, 1):
+                if not raw.strip():
+                    continue
+                cart_id = f"line {line_no}"
+                try:
+                    record = json.loads(raw)
+                    cart_id = str(record.get("cart_id", cart_id))
+                    cart = Cart()
+                    for item in record["items"]:
+                        cart.add(catalog[item["sku"].upper()], _quantity(item["qty"]))
+                except (KeyError, ValueError, TypeError, AttributeError) as e:
+                    yield cart_id, _parse_error(e)
+                    continue
+                yield cart_id, cart
+        else:
+            rows = (r for r in csv.reader(f) if r and r[0] != "cart_id")
+            for cart_id, lines in groupby(rows, key=lambda r: r[0]):
+                try:
+                    cart = Cart()
+                    for row in lines:
+                        if len(row) != 3:
+                            raise ValueError(f"expected cart_id,sku,qty, got {len(row)} fields")
+                        _, sku, qty = row
+                        cart.add(catalog[sku.strip().upper()], _quantity(qty))
+                except (KeyError, ValueError) as e:
+                    yield cart_id, _parse_error(e)
+                    continue
+                yield cart_id, cart
+
+def chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    it = iter(iterable)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+class LatencyHistogram:
+    """Fixed-size log-scale histogram: memory stays constant however many samples are added,
+    and percentiles are reported as the upper edge of their bucket (within `growth` of exact)."""
+    def __init__(self, lowest: float = 1e-6, highest: float = 100.0, growth: float = 1.05):
+        self._lowest = lowest
+        self._growth = growth
+        self._log_growth = math.log(growth)
+        self._counts = array("Q", bytes(8 * (int(math.log(highest / lowest) / self._log_growth) + 2)))
+        self.count = 0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        if seconds <= self._lowest:
+            i = 0
+        else:
+            i = min(len(self._counts) - 1, int(math.log(seconds / self._lowest) / self._log_growth) + 1)
+        self._counts[i] += 1
+        self.count += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, pct: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, round(pct / 100 * self.count))
+        seen = 0
+        for i, n in enumerate(self._counts):
+            seen += n
+            if seen >= rank:
+                return min(self._lowest * self._growth ** i, self.max)
+        return self.max
+
+def bulk_checkout(service: OrderService, carts: Iterable[Tuple[str, Union[Cart, CartParseError]]], out: TextIO,
+                  chunk_size: int = 1000) -> Dict[str, float]:
+    """Checks carts out chunk by chunk, writing receipts as it goes; returns throughput stats.
+
+    Carts that could not be read or checked out get a FAILED receipt and are counted in `failed`.
+    """
+    latencies = LatencyHistogram()
+    carts_seen = failed = 0
+    started = time.perf_counter()
+    for chunk in chunked(carts, chunk_size):
+        receipts = []
+        for cart_id, cart in chunk:
+            carts_seen += 1
+            if isinstance(cart, CartParseError):
+                receipts.append(f"=== {cart_id} ===\nFAILED: {cart}\n")
+                failed += 1
+                continue
+            t0 = time.perf_counter()
+            try:
+                receipt = service.checkout(cart)
+            except ValueError as e:
+                receipt = f"FAILED: {e}"
+                failed += 1
+            latencies.add(time.perf_counter() - t0)
+            receipts.append(f"=== {cart_id} ===\n{receipt}\n")
+        out.write("\n".join(receipts) + "\n")
+    elapsed = time.perf_counter() - started
+    return {
+        "carts": carts_seen,
+        "failed": failed,
+        "seconds": elapsed,
+        "carts_per_sec": carts_seen / elapsed if elapsed else 0.0,
+        "p50_ms": latencies.percentile(50) * 1000,
+        "p99_ms": latencies.percentile(99) * 1000,
+    }
+
+def run_batch_cli(argv: List[str], catalog: Mapping[str, Product]) -> None:
+    import argparse
+    parser = argparse.ArgumentParser(description="Check out carts from a CSV or JSONL dump.")
+    parser.add_argument("input", help="orders file (.csv or .jsonl)")
+    parser.add_argument("-o", "--output", default="receipts.txt", help="where receipts are written")
+    parser.add_argument("--processor", choices=("stripe", "paypal"), default="stripe")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--no-discounts", action="store_true", help="skip the demo pricing rules")
+    args = parser.parse_args(argv)
+
+    rules = [] if args.no_discounts else [pct_off_over(2000, 0.10), buy_n_get_m_free("COF", 2, 1)]
+    charge_fn = stripe_charge if args.processor == "stripe" else paypal_charge
+    service = OrderService(charge_fn, rules)
+    with open(args.output, "w") as out:
+        stats = bulk_checkout(service, read_carts(args.input, catalog), out, args.chunk_size)
+
+    print(f"Checked out {stats['carts']} carts ({stats['failed']} failed) in {stats['seconds']:.2f}s")
+    print(f"Throughput: {stats['carts_per_sec']:.0f} carts/sec")
+    print(f"Latency: p50 {stats['p50_ms']:.3f} ms, p99 {stats['p99_ms']:.3f} ms")
+    print(f"Receipts written to {args.output}")
+
 # --- Interactive CLI ---
 if __name__ == "__main__":
+    import sys
+
     catalog = {
         "COF": Product("COF", "Coffee", 599),
         "TEA": Product("TEA", "Tea", 399),
         "CAC": Product("CAC", "Cocoa", 499),
     }
 
+    # non-interactive: python Lab0.py orders.csv -o receipts.txt
+    if len(sys.argv) > 1:
+        run_batch_cli(sys.argv[1:], catalog)
+        exit()
+
     cart = Cart()
     print("Available products:")
     for sku, p in catalog.items():
@@ -91,7 +405,7 @@ if __name__ == "__main__":
             cart.add(catalog[sku.upper()], int(qty_str))
         except Exception:
             print("Invalid input. Try again.")
-    if not cart.items:
+    if not cart:
         print("Cart empty. Exiting.")
         exit()
 
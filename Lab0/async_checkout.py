@@ -0,0 +1,193 @@
+import asyncio
+import inspect
+import random
+import uuid
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from Lab0 import Cart, ChargeFn, OrderService, PricingRule, format_receipt
+
+# --- DIP: async processors receive an idempotency key so retries are never charged twice ---
+AsyncChargeFn = Callable[[int, str], Awaitable[str]]
+
+RETRYABLE = (asyncio.TimeoutError, ConnectionError)
+
+class AsyncOrderService:
+    """Checks out carts without blocking on the processor: bounded in-flight charges,
+    per-call timeouts and retries with exponential backoff under one idempotency key.
+
+    Concurrent checkouts with the same key share one charge. The transaction ids of the last
+    `max_completed` keys are remembered, so a late repeat returns the same receipt without
+    calling the processor; older keys fall back on the processor's own idempotency."""
+    def __init__(self, charge: Union[AsyncChargeFn, ChargeFn], pricing_rules: Iterable[PricingRule],
+                 max_in_flight: int = 10, timeout_s: float = 2.0, retries: int = 3, backoff_s: float = 0.05,
+                 max_completed: int = 10000):
+        assert max_in_flight > 0 and retries >= 0 and max_completed > 0
+        self.charge = charge
+        self._pricing = OrderService(charge, pricing_rules)
+        self.timeout_s = timeout_s
+        self.retries = retries
+        self.backoff_s = backoff_s
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self.max_completed = max_completed
+        self._completed: "OrderedDict[str, str]" = OrderedDict()  # least recently used first
+        self._in_flight: Dict[str, "asyncio.Future[str]"] = {}
+        self._is_async = inspect.iscoroutinefunction(charge) or inspect.iscoroutinefunction(
+            getattr(charge, "__call__", None))
+
+    @property
+    def rules(self) -> Tuple[PricingRule, ...]:
+        return self._pricing.rules
+
+    async def _call_processor(self, amount_cents: int, key: str) -> str:
+        if self._is_async:
+            return await self.charge(amount_cents, key)
+        # Sync processors know nothing about keys; run them off the event loop.
+        return await asyncio.to_thread(self.charge, amount_cents)
+
+    async def _charge_once(self, amount_cents: int, key: str) -> str:
+        txn_id = self._completed.get(key)
+        if txn_id is not None:
+            self._completed.move_to_end(key)
+            return txn_id
+        charge = self._in_flight.get(key)
+        if charge is None:
+            charge = self._in_flight[key] = asyncio.ensure_future(self._charge_with_retry(amount_cents, key))
+            charge.add_done_callback(lambda _, key=key: self._in_flight.pop(key, None))
+        # shielded: a cancelled caller must not cancel the charge the others are waiting for
+        return await asyncio.shield(charge)
+
+    async def _charge_with_retry(self, amount_cents: int, key: str) -> str:
+        attempt = 0
+        while True:
+            try:
+                async with self._slots:
+                    txn_id = await asyncio.wait_for(self._call_processor(amount_cents, key), self.timeout_s)
+                self._completed[key] = txn_id
+                if len(self._completed) > self.max_completed:
+                    self._completed.popitem(last=False)
+                return txn_id
+            except RETRYABLE:
+                # Without an idempotency key a retry could charge twice, so only keyed processors retry.
+                if attempt >= self.retries or not self._is_async:
+                    raise
+                await asyncio.sleep(self.backoff_s * (2 ** attempt))
+                attempt += 1
+
+    async def checkout(self, cart: Cart, idempotency_key: Optional[str] = None) -> str:
+        subtotal, discount, total = self._pricing.price(cart)
+        txn_id = await self._charge_once(total, idempotency_key or uuid.uuid4().hex)
+        return format_receipt(subtotal, discount, total, txn_id)
+
+    async def checkout_many(self, carts: Iterable[Cart]) -> List[Union[str, BaseException]]:
+        """Receipts in input order; a cart whose charge finally failed yields its exception."""
+        return await asyncio.gather(*(self.checkout(c) for c in carts), return_exceptions=True)
+
+# --- Local stand-in for a payment processor ---
+class StubProcessor:
+    """Simulates network latency, transient failures and responses lost after the charge
+    went through. Like a real processor it charges each idempotency key only once.
+
+    `captures` records the money actually taken per key and `charge_calls` how many calls
+    reached the charge step per key, so a caller that double charges (e.g. retrying under a
+    fresh key) shows up as an extra key or an extra capture. The first
+    `lost_responses_per_key` responses for every key are always lost after charging.
+    """
+    def __init__(self, latency_s: float = 0.02, failure_rate: float = 0.1, lost_response_rate: float = 0.05,
+                 lost_responses_per_key: int = 0, seed: Optional[int] = None):
+        self.latency_s = latency_s
+        self.failure_rate = failure_rate
+        self.lost_response_rate = lost_response_rate
+        self.lost_responses_per_key = lost_responses_per_key
+        self.captures: Dict[str, List[int]] = {}
+        self.charge_calls: Dict[str, int] = {}
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight_seen = 0
+        self._rng = random.Random(seed)
+
+    async def __call__(self, amount_cents: int, idempotency_key: str) -> str:
+        if amount_cents <= 0: raise ValueError("Amount must be positive")
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight_seen = max(self.max_in_flight_seen, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency_s * self._rng.uniform(0.5, 1.5))
+            if self._rng.random() < self.failure_rate:
+                raise ConnectionError("processor unavailable")
+            calls = self.charge_calls[idempotency_key] = self.charge_calls.get(idempotency_key, 0) + 1
+            if idempotency_key not in self.captures:
+                self.captures[idempotency_key] = [amount_cents]
+            elif self.captures[idempotency_key][0] != amount_cents:
+                # same key, different amount: a real processor rejects this; record it so it is caught
+                self.captures[idempotency_key].append(amount_cents)
+            if calls <= self.lost_responses_per_key or self._rng.random() < self.lost_response_rate:
+                raise ConnectionError("connection reset after charge")
+            return f"stub_txn_{idempotency_key[:12]}"
+        finally:
+            self.in_flight -= 1
+
+def check_charged_once(processor: StubProcessor, expected: Dict[str, int]) -> None:
+    """Asserts that exactly the expected keys were charged, each once, for its own amount."""
+    assert set(processor.captures) == set(expected), "charges under unexpected idempotency keys"
+    for key, amount in expected.items():
+        assert processor.captures[key] == [amount], f"{key} charged {processor.captures[key]}, expected [{amount}]"
+
+if __name__ == "__main__":
+    import time
+    from Lab0 import Product, buy_n_get_m_free, pct_off_over
+
+    coffee, tea = Product("COF", "Coffee", 599), Product("TEA", "Tea", 399)
+    rules = [pct_off_over(2000, 0.10), buy_n_get_m_free("COF", 2, 1)]
+    carts = []
+    for i in range(200):
+        cart = Cart()
+        cart.add(coffee, 1 + i % 4)
+        cart.add(tea, 1 + i % 3)
+        carts.append(cart)
+
+    processor = StubProcessor(latency_s=0.03, failure_rate=0.2, lost_response_rate=0.1, seed=7)
+    service = AsyncOrderService(processor, rules, max_in_flight=20, timeout_s=0.5, retries=5, backoff_s=0.01)
+    keys = [f"cart-{i:04d}" for i in range(len(carts))]
+
+    async def run_all():
+        return await asyncio.gather(*(service.checkout(c, k) for c, k in zip(carts, keys)), return_exceptions=True)
+
+    t0 = time.perf_counter()
+    results = asyncio.run(run_all())
+    elapsed = time.perf_counter() - t0
+
+    ok = {k: r for k, r in zip(keys, results) if isinstance(r, str)}
+    retried = sum(1 for k in ok if processor.charge_calls[k] > 1)
+    print(f"{len(ok)}/{len(carts)} carts charged in {elapsed:.2f}s "
+          f"({processor.calls} processor calls, max {processor.max_in_flight_seen} in flight)")
+    print(f"{retried} carts were retried after a lost response; captures per cart: "
+          f"{sorted(set(len(v) for v in processor.captures.values()))}")
+    # every receipt's cart was charged exactly once for its own total; failed carts may or may
+    # not have gone through (their last response was lost), but never more than once
+    totals = {k: service._pricing.price(c)[2] for k, c in zip(keys, carts)}
+    check_charged_once(processor, {k: totals[k] for k in processor.captures})
+    assert set(ok) <= set(processor.captures) and processor.max_in_flight_seen <= 20
+
+    # deterministic case: the first response for every key is lost, so every cart needs a retry
+    processor = StubProcessor(latency_s=0.001, failure_rate=0.0, lost_response_rate=0.0, lost_responses_per_key=1)
+    service = AsyncOrderService(processor, rules, retries=2, backoff_s=0.001)
+    receipt = asyncio.run(service.checkout(carts[0], "lost-once"))
+    assert processor.charge_calls["lost-once"] == 2
+    check_charged_once(processor, {"lost-once": totals["cart-0000"]})
+    print("retry after a lost response: charged once, receipt issued")
+
+    # two concurrent checkouts under one key share a single charge
+    processor = StubProcessor(latency_s=0.01, failure_rate=0.0, lost_response_rate=0.0)
+    service = AsyncOrderService(processor, rules, max_completed=2)
+
+    async def twice():
+        return await asyncio.gather(service.checkout(carts[0], "dup"), service.checkout(carts[0], "dup"))
+
+    first, second = asyncio.run(twice())
+    assert first == second and processor.calls == 1 and not service._in_flight
+    check_charged_once(processor, {"dup": totals["cart-0000"]})
+    for key in ("a", "b", "c"):
+        asyncio.run(service.checkout(carts[0], key))
+    assert list(service._completed) == ["b", "c"]
+    print("concurrent duplicates: one processor call; completed keys bounded")
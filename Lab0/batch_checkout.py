@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, Sequence
+
+import numpy as np
+
+from Lab0 import Cart, PricingRule
+
+# --- Vectorized repricing: many carts as columns, one kernel per rule ---
+@dataclass
+class BatchResult:
+    cart_ids: np.ndarray
+    subtotal_cents: np.ndarray
+    discount_cents: np.ndarray
+    total_cents: np.ndarray
+
+def _pct_off_over_kernel(subtotal: np.ndarray, threshold_cents: int, percent: float) -> np.ndarray:
+    # Same float multiply + truncation as int(subtotal * percent) in the scalar rule.
+    off = (subtotal.astype(np.float64) * percent).astype(np.int64)
+    return np.where(subtotal >= threshold_cents, off, 0)
+
+def _buy_n_get_m_free_kernel(n_carts: int, cart_idx: np.ndarray, sku_codes: np.ndarray, qty: np.ndarray,
+                             price_cents: np.ndarray, code: int, n: int, m: int) -> np.ndarray:
+    mask = sku_codes == code
+    line_qty = np.zeros(n_carts, dtype=np.int64)
+    np.add.at(line_qty, cart_idx[mask], qty[mask])
+    line_price = np.zeros(n_carts, dtype=np.int64)
+    line_price[cart_idx[mask]] = price_cents[mask]
+    return (line_qty // (n + m)) * m * line_price
+
+def price_batch(cart_ids: np.ndarray, sku_codes: np.ndarray, qty: np.ndarray, price_cents: np.ndarray,
+                rules: Iterable[PricingRule], sku_index: Dict[str, int]) -> BatchResult:
+    """Prices every cart in the columns at once; results are ordered by sorted cart id.
+
+    `sku_index` maps the SKU strings used by the rules to the integer codes in `sku_codes`.
+    """
+    qty = np.asarray(qty, dtype=np.int64)
+    price_cents = np.asarray(price_cents, dtype=np.int64)
+    sku_codes = np.asarray(sku_codes)
+    ids, cart_idx = np.unique(np.asarray(cart_ids), return_inverse=True)
+    n_carts = len(ids)
+
+    subtotal = np.zeros(n_carts, dtype=np.int64)
+    np.add.at(subtotal, cart_idx, qty * price_cents)
+
+    discount = np.zeros(n_carts, dtype=np.int64)
+    for rule in rules:
+        spec = getattr(rule, "spec", None)
+        if spec is None:
+            raise ValueError(f"Rule {rule!r} has no vectorized kernel")
+        kind, *params = spec
+        if kind == "pct_off_over":
+            discount += _pct_off_over_kernel(subtotal, *params)
+        elif kind == "buy_n_get_m_free":
+            sku, n, m = params
+            if sku in sku_index:
+                discount += _buy_n_get_m_free_kernel(n_carts, cart_idx, sku_codes, qty, price_cents,
+                                                     sku_index[sku], n, m)
+        else:
+            raise ValueError(f"Unsupported rule kind: {kind!r}")
+
+    total = np.maximum(subtotal - discount, 0)
+    return BatchResult(ids, subtotal, discount, total)
+
+def carts_to_columns(carts: Sequence[Cart], sku_index: Dict[str, int]):
+    """Flattens Cart objects into (cart_ids, sku_codes, qty, price_cents) columns."""
+    rows = [(cid, sku_index[ci.product.sku], ci.qty, ci.product.price_cents)
+            for cid, cart in enumerate(carts) for ci in cart.items]
+    cols = np.array(rows, dtype=np.int64).reshape(-1, 4)
+    return cols[:, 0], cols[:, 1], cols[:, 2], cols[:, 3]
+
+# --- Benchmark: vectorized batch vs. scalar per-cart loop ---
+if __name__ == "__main__":
+    import random
+    import time
+    from Lab0 import Product, buy_n_get_m_free, pct_off_over
+
+    rng = random.Random(42)
+    catalog = [Product(f"SKU{i:03d}", f"Item {i}", rng.randint(99, 4999)) for i in range(200)]
+    sku_index = {p.sku: i for i, p in enumerate(catalog)}
+    rules = [pct_off_over(2000, 0.10), buy_n_get_m_free("SKU000", 2, 1), buy_n_get_m_free("SKU001", 3, 1)]
+
+    carts = []
+    for _ in range(20_000):
+        cart = Cart()
+        for _ in range(rng.randint(1, 20)):
+            cart.add(catalog[rng.randrange(len(catalog))], rng.randint(1, 5))
+        carts.append(cart)
+
+    t0 = time.perf_counter()
+    scalar = []
+    for cart in carts:
+        subtotal = cart.subtotal_cents
+        discount = sum(r(cart) for r in rules)
+        scalar.append((subtotal, discount, max(subtotal - discount, 0)))
+    t_scalar = time.perf_counter() - t0
+
+    columns = carts_to_columns(carts, sku_index)
+    t0 = time.perf_counter()
+    result = price_batch(*columns, rules, sku_index)
+    t_batch = time.perf_counter() - t0
+
+    expected = np.array(scalar, dtype=np.int64)
+    assert (expected[:, 0] == result.subtotal_cents).all()
+    assert (expected[:, 1] == result.discount_cents).all()
+    assert (expected[:, 2] == result.total_cents).all()
+    print(f"{len(carts)} carts, {len(columns[0])} lines")
+    print(f"per-cart loop : {t_scalar*1000:8.1f} ms")
+    print(f"price_batch   : {t_batch*1000:8.1f} ms  ({t_scalar/t_batch:.1f}x)")
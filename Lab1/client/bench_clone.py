@@ -0,0 +1,36 @@
+from __future__ import annotations
+import time
+from copy import deepcopy
+from domain.models import PrototypeRegistry, margherita, veggie
+from client.bench_memory import DictPizza
+
+N = 200_000
+
+def rate(label: str, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {N / elapsed:>12,.0f} clones/sec")
+    return elapsed
+
+def main() -> None:
+    registry = PrototypeRegistry()
+    registry.register("margherita", margherita("L"))
+    registry.register("veggie", veggie("M"))
+    # Pizza.__deepcopy__ now goes through clone(), so the deepcopy baseline uses the original
+    # plain-dataclass representation instead
+    proto = margherita("L")
+    reference = DictPizza(proto.name, proto.size, proto.base_price, list(proto.toppings), proto.extra_cheese)
+
+    print(f"=== Prototype clone benchmark ({N:,} clones) ===")
+    slow = rate("deepcopy (dataclass)", lambda: [deepcopy(reference) for _ in range(N)])
+    fast = rate("registry.clone", lambda: [registry.clone("margherita") for _ in range(N)])
+    rate("registry.clone_many", lambda: registry.clone_many("veggie", N))
+    print(f"\nclone() speedup over deepcopy of the dataclass pizza: {slow / fast:.1f}x")
+
+    clone = registry.clone("margherita")
+    clone.toppings.append("chili flakes")
+    assert registry.clone("margherita").toppings == ["basil", "tomato"]
+
+if __name__ == "__main__":
+    main()
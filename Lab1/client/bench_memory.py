@@ -0,0 +1,58 @@
+from __future__ import annotations
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import List
+from domain.models import Pizza, margherita, pepperoni, veggie
+
+
+@dataclass
+class DictPizza:
+    """The original representation: a plain dataclass with its own list of topping strings."""
+    name: str
+    size: str
+    base_price: float
+    toppings: List[str] = field(default_factory=list)
+    extra_cheese: bool = False
+
+
+PRESETS = [margherita, pepperoni, veggie]
+SIZES = ['S', 'M', 'L']
+
+
+def old_form(i: int) -> DictPizza:
+    p = PRESETS[i % 3](SIZES[i % 3])
+    return DictPizza(p.name, p.size, p.base_price, list(p.toppings), i % 7 == 0)
+
+
+def new_form(i: int) -> Pizza:
+    p = PRESETS[i % 3](SIZES[i % 3])
+    p.extra_cheese = i % 7 == 0
+    return p
+
+
+def measure(label: str, make, n: int) -> int:
+    tracemalloc.start()
+    book = [make(i) for i in range(n)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {current / 2**20:>9.1f} MiB  ({current / n:.0f} bytes/pizza)")
+    del book
+    return current
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"=== Order book memory ({n:,} pizzas) ===")
+    old = measure("dataclass + topping lists", old_form, n)
+    new = measure("__slots__ + flyweight ids", new_form, n)
+    print(f"\nreduction: {old / new:.1f}x")
+
+    # same observable behaviour
+    for i in range(21):
+        o, p = old_form(i), new_form(i)
+        assert p.toppings == o.toppings and p.size == o.size and p.extra_cheese == o.extra_cheese
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,22 @@
 from .models import (
     Pizza,
+    Size,
     margherita,
     pepperoni,
     veggie,
     Order,
     OrderBuilder,
 )
-from .factory import SimplePizzaFactory
+from .factory import SimplePizzaFactory, PizzaPool
 
 __all__ = [
     "Pizza",
+    "Size",
     "margherita",
     "pepperoni",
     "veggie",
     "Order",
     "OrderBuilder",
     "SimplePizzaFactory",
+    "PizzaPool",
 ]
@@ -1,5 +1,7 @@
 from .pizza_factory import SimplePizzaFactory
+from .pizza_pool import PizzaPool
 
 __all__ = [
     "SimplePizzaFactory",
+    "PizzaPool",
 ]
@@ -1,7 +1,8 @@
 
 from __future__ import annotations
-from typing import Protocol
+from typing import Callable, Dict, Iterable, List, Optional, Protocol, Tuple
 from ..models.pizza import Pizza, margherita, pepperoni, veggie
+from .pizza_pool import PizzaPool
 
 class PizzaFactory(Protocol):
     def create(self, kind: str, size: str = 'M') -> Pizza:
@@ -15,9 +16,46 @@ class SimplePizzaFactory:
         'veggie': veggie,
     }
 
-    def create(self, kind: str, size: str = 'M') -> Pizza:
+    def __init__(self, pool: Optional[PizzaPool] = None):
+        self.pool = pool
+
+    def _resolve(self, kind: str) -> Tuple[str, Callable[..., Pizza]]:
         key = kind.strip().lower()
         ctor = self._registry.get(key)
         if not ctor:
             raise ValueError(f"Unknown pizza kind: {kind!r}. Known kinds: {sorted(self._registry)}")
+        return key, ctor
+
+    def create(self, kind: str, size: str = 'M') -> Pizza:
+        key, ctor = self._resolve(kind)
+        if self.pool is not None:
+            return self.pool.acquire(key, ctor, size)
         return ctor(size=size)
+
+    def create_many(self, kind: str, sizes: Iterable[str]) -> List[Pizza]:
+        """Creates one pizza per size, resolving the kind only once."""
+        key, ctor = self._resolve(kind)
+        if self.pool is not None:
+            acquire = self.pool.acquire
+            return [acquire(key, ctor, size) for size in sizes]
+        return [ctor(size=size) for size in sizes]
+
+    def create_batch(self, specs: Iterable[Tuple[str, str]]) -> List[Pizza]:
+        """Creates pizzas from (kind, size) pairs, resolving each distinct kind once."""
+        resolved: Dict[str, Tuple[str, Callable[..., Pizza]]] = {}
+        pizzas = []
+        for kind, size in specs:
+            entry = resolved.get(kind)
+            if entry is None:
+                entry = resolved[kind] = self._resolve(kind)
+            key, ctor = entry
+            pizzas.append(self.pool.acquire(key, ctor, size) if self.pool is not None else ctor(size=size))
+        return pizzas
+
+    def release(self, pizza: Pizza) -> None:
+        """Hands a pizza that is no longer needed back to the pool, if there is one.
+
+        Releasing the same pizza twice raises ValueError.
+        """
+        if self.pool is not None:
+            self.pool.release(pizza)
@@ -0,0 +1,41 @@
+
+from __future__ import annotations
+from typing import Callable, Dict, Tuple
+from ..models.pizza import Pizza
+
+class PizzaPool:
+    """Object Pool: recycles released pizzas instead of allocating new ones.
+
+    A recycled pizza is reset from a cached template of the requested kind and size.
+    """
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._free: Dict[int, Pizza] = {}  # by id(), so a pizza can only be free once
+        self._templates: Dict[Tuple[str, str], Pizza] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, kind: str, ctor: Callable[..., Pizza], size: str) -> Pizza:
+        template = self._templates.get((kind, size))
+        if template is None:
+            template = self._templates[(kind, size)] = ctor(size=size)
+        if self._free:
+            self.hits += 1
+            _, pizza = self._free.popitem()
+            pizza.reset(template)
+            return pizza
+        self.misses += 1
+        return template.clone()
+
+    def release(self, pizza: Pizza) -> None:
+        if id(pizza) in self._free:
+            raise ValueError("Pizza was already released to the pool")
+        if len(self._free) < self.max_size:
+            self._free[id(pizza)] = pizza
+
+    @property
+    def available(self) -> int:
+        return len(self._free)
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'available': len(self._free)}
@@ -1,9 +1,10 @@
-from .pizza import Pizza, margherita, pepperoni, veggie
+from .pizza import Pizza, Size, margherita, pepperoni, veggie
 from .order_builder import Order, OrderBuilder
 from .prototype import PrototypeRegistry
 
 __all__ = [
     "Pizza",
+    "Size",
     "margherita",
     "pepperoni",
     "veggie",
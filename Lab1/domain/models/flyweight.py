@@ -0,0 +1,37 @@
+
+from __future__ import annotations
+from typing import Dict, Iterable, List, Tuple
+
+ToppingIds = Tuple[int, ...]
+
+
+class ToppingTable:
+    """Flyweight table: each topping name is stored once and referred to by a small integer id.
+
+    Identical topping combinations are interned too, so pizzas with the same toppings share one tuple.
+    """
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._combos: Dict[ToppingIds, ToppingIds] = {}
+
+    def id_of(self, name: str) -> int:
+        topping_id = self._ids.get(name)
+        if topping_id is None:
+            topping_id = self._ids[name] = len(self._names)
+            self._names.append(name)
+        return topping_id
+
+    def intern(self, names: Iterable[str]) -> ToppingIds:
+        ids = tuple(self.id_of(n) for n in names)
+        return self._combos.setdefault(ids, ids)
+
+    def names(self, ids: ToppingIds) -> List[str]:
+        table = self._names
+        return [table[i] for i in ids]
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+TOPPINGS = ToppingTable()
@@ -1,11 +1,133 @@
 
 from __future__ import annotations
+import weakref
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Any, Iterable, Iterator, List, Mapping, Optional
 from .pizza import Pizza
 
+
+def _cents(pizza: Pizza) -> int:
+    return round(pizza.price() * 100)
+
+
+def _prune(lists: dict) -> None:
+    for key in [key for key, (ref, _) in lists.items() if ref() is None]:
+        del lists[key]
+
+
+class PizzaList(list):
+    """List of an order's pizzas that keeps the order's running subtotal in step with every change.
+
+    Each pizza in the list keeps a weak reference back to it, and moves the subtotal itself when
+    it is edited (see Pizza._repriced). Counting starts at the first subtotal read; until then
+    the pizzas do not track the list, so orders that are never priced cost nothing extra.
+    """
+    def __init__(self, iterable: Iterable[Pizza] = (), owner: Optional['Order'] = None):
+        super().__init__(iterable)
+        self._owner = owner
+        self._subtotal_cents: Optional[int] = None  # None until counted
+
+    def __reduce_ex__(self, protocol):
+        # rebuild through __init__ so copies count their own subtotal and attach to their pizzas
+        return (type(self), (list(self),), {'_owner': self._owner})
+
+    def _attach(self, pizza: Pizza) -> None:
+        lists = pizza._lists
+        if lists is None:
+            lists = pizza._lists = {}
+        entry = lists.get(id(self))
+        if entry is not None and entry[0]() is self:  # a dead list's id may have been reused
+            entry[1] += 1
+        else:
+            lists[id(self)] = [self._ref, 1]
+            size = len(lists)
+            if size >= 64 and not size & (size - 1):
+                _prune(lists)  # at every power of two, so shared pizzas shed dead orders
+        self._subtotal_cents += _cents(pizza)
+
+    def _detach(self, pizza: Pizza) -> None:
+        key = id(self)
+        entry = pizza._lists[key]
+        entry[1] -= 1
+        if not entry[1]:
+            del pizza._lists[key]
+        self._subtotal_cents -= _cents(pizza)
+
+    def _recount(self) -> None:
+        self._ref = weakref.ref(self)
+        self._subtotal_cents = 0
+        for pizza in self:
+            self._attach(pizza)
+
+    def _reattach(self, mutate) -> None:
+        # for bulk changes: detach everything, change the list, attach what is left
+        if self._subtotal_cents is None:
+            mutate()
+            return
+        for pizza in self:
+            self._detach(pizza)
+        mutate()
+        self._recount()
+
+    def release(self) -> None:
+        """Stops following the pizzas' edits; for a list its order no longer uses."""
+        if self._subtotal_cents is not None:
+            for pizza in self:
+                self._detach(pizza)
+            self._subtotal_cents = None
+
+    def subtotal_cents(self) -> int:
+        if self._subtotal_cents is None:
+            self._recount()
+        return self._subtotal_cents
+
+    def append(self, pizza: Pizza) -> None:
+        super().append(pizza)
+        if self._subtotal_cents is not None:
+            self._attach(pizza)
+
+    def insert(self, index: int, pizza: Pizza) -> None:
+        super().insert(index, pizza)
+        if self._subtotal_cents is not None:
+            self._attach(pizza)
+
+    def extend(self, pizzas: Iterable[Pizza]) -> None:
+        for p in pizzas:
+            self.append(p)
+
+    def __iadd__(self, pizzas: Iterable[Pizza]) -> 'PizzaList':
+        self.extend(pizzas)
+        return self
+
+    def remove(self, pizza: Pizza) -> None:
+        self.pop(self.index(pizza))  # the equal pizza in the list may be another object
+
+    def pop(self, index: int = -1) -> Pizza:
+        pizza = super().pop(index)
+        if self._subtotal_cents is not None:
+            self._detach(pizza)
+        return pizza
+
+    def clear(self) -> None:
+        self._reattach(super().clear)
+
+    def __setitem__(self, index, value) -> None:
+        self._reattach(lambda: super(PizzaList, self).__setitem__(index, value))
+
+    def __delitem__(self, index) -> None:
+        self._reattach(lambda: super(PizzaList, self).__delitem__(index))
+
+    def __imul__(self, n: int) -> 'PizzaList':
+        self._reattach(lambda: super(PizzaList, self).__imul__(n))
+        return self
+
+
 @dataclass
 class Order:
+    """Keeps a running subtotal, so total() does not re-price every pizza.
+
+    Editing a pizza after it was added is picked up too: the pizza updates the subtotal itself.
+    """
     customer: str
     address: Optional[str]
     pizzas: List[Pizza] = field(default_factory=list)
@@ -13,8 +135,26 @@ class Order:
     coupon_pct: float = 0.0
     contactless: bool = False
 
+    def __setattr__(self, name: str, value) -> None:
+        if name == 'pizzas' and not (isinstance(value, PizzaList) and value._owner is self):
+            old = self.__dict__.get('pizzas')
+            if old is not None and old._owner is self:
+                old.release()
+            value = PizzaList(value, self)
+        object.__setattr__(self, name, value)
+
+    def add_pizza(self, pizza: Pizza) -> None:
+        self.pizzas.append(pizza)
+
+    def remove_pizza(self, pizza: Pizza) -> None:
+        self.pizzas.remove(pizza)
+
+    @property
+    def subtotal(self) -> float:
+        return self.pizzas.subtotal_cents() / 100.0
+
     def total(self) -> float:
-        subtotal = sum(p.price() for p in self.pizzas)
+        subtotal = self.subtotal
         discount = subtotal * (self.coupon_pct / 100.0)
         return round(subtotal - discount, 2)
 
@@ -36,6 +176,10 @@ class OrderBuilder:
         self._pizzas.append(pizza)
         return self
 
+    def add_pizzas(self, pizzas: Iterable[Pizza]) -> 'OrderBuilder':
+        self._pizzas.extend(pizzas)
+        return self
+
     def with_note(self, note: str) -> 'OrderBuilder':
         self._note = note
         return self
@@ -52,8 +196,25 @@ class OrderBuilder:
         return Order(
             customer=self._customer,
             address=self._address,
-            pizzas=list(self._pizzas),
+            pizzas=self._pizzas,  # Order copies it into its own PizzaList
             note=self._note,
             coupon_pct=self._coupon_pct,
             contactless=self._contactless,
         )
+
+    @staticmethod
+    def build_many(specs: Iterable[Mapping[str, Any]]) -> Iterator[Order]:
+        """Builds one order per spec, lazily.
+
+        Each spec is a mapping with a 'customer' key and optional 'address', 'pizzas'
+        (any iterable, consumed once), 'note', 'coupon_pct' and 'contactless' keys.
+        """
+        for spec in specs:
+            yield Order(
+                customer=spec['customer'],
+                address=spec.get('address'),
+                pizzas=spec.get('pizzas', ()),
+                note=spec.get('note'),
+                coupon_pct=max(0.0, min(100.0, spec.get('coupon_pct', 0.0))),
+                contactless=spec.get('contactless', False),
+            )
@@ -1,26 +1,189 @@
 
 from __future__ import annotations
-from dataclasses import dataclass, field
-from copy import deepcopy
-from typing import List
+from enum import IntEnum
+from typing import Iterable, List, Optional, Union
+from .flyweight import TOPPINGS, ToppingIds
+
+
+class Size(IntEnum):
+    S = 0
+    M = 1
+    L = 2
+
+    @classmethod
+    def parse(cls, value: Union[str, 'Size']) -> 'Size':
+        if isinstance(value, Size):
+            return value
+        try:
+            return cls[value]
+        except KeyError:
+            raise ValueError(f"Unknown pizza size: {value!r}. Known sizes: {[s.name for s in cls]}") from None
+
+
+SIZE_MULTIPLIER = (0.9, 1.0, 1.25)  # indexed by Size
+
+
+class ToppingList(list):
+    """Editable view of a pizza's toppings.
+
+    A mutation is applied to the pizza's current toppings (not to this possibly stale view) and
+    stored on the pizza; the view then shows the result. Copies are plain, detached lists.
+    """
+    def __init__(self, iterable: Iterable[str] = (), owner: Optional['Pizza'] = None):
+        super().__init__(iterable)
+        self._owner = owner
+
+    def __reduce_ex__(self, protocol):
+        return (list, (list(self),))
+
+
+def _mutator(name: str):
+    method = getattr(list, name)
+    def wrapper(self, *args, **kwargs):
+        owner = self._owner
+        if owner is None:
+            return method(self, *args, **kwargs)
+        current = list(TOPPINGS.names(owner._topping_ids))
+        result = method(current, *args, **kwargs)
+        owner._set_toppings(current)
+        list.__setitem__(self, slice(None), current)
+        return self if result is current else result  # += and *= return the list itself
+    wrapper.__name__ = name
+    return wrapper
+
+for _name in ('append', 'extend', 'insert', 'remove', 'pop', 'clear', 'sort', 'reverse',
+              '__setitem__', '__delitem__', '__iadd__', '__imul__'):
+    setattr(ToppingList, _name, _mutator(_name))
+
 
-@dataclass
 class Pizza:
-    name: str
-    size: str  # 'S', 'M', 'L'
-    base_price: float
-    toppings: List[str] = field(default_factory=list)
-    extra_cheese: bool = False
+    """Compact pizza: no instance __dict__, toppings held as interned flyweight ids, size as a small enum.
+
+    The price is cached and dropped whenever a field that affects it changes. A pizza also
+    remembers the order lists holding it (`_lists`: id -> [weak reference, occurrences]) and moves
+    their running subtotals by the price difference, so no order has to recount after an edit.
+    The references are weak, so a pizza shared by many orders does not keep them alive.
+    """
+    __slots__ = ('name', '_size', '_base_price', '_topping_ids', '_extra_cheese', '_price', '_lists')
+
+    def __init__(self, name: str, size: Union[str, Size], base_price: float,
+                 toppings: Iterable[str] = (), extra_cheese: bool = False):
+        self.name = name
+        self._size = Size.parse(size)
+        self._base_price = base_price
+        self._topping_ids: ToppingIds = TOPPINGS.intern(toppings)
+        self._extra_cheese = extra_cheese
+        self._price: Optional[float] = None
+        self._lists: Optional[dict] = None
+
+    def _held_cents(self) -> int:
+        return round(self.price() * 100) if self._lists else 0
+
+    def _repriced(self, old_cents: int) -> None:
+        # called after a change that affects the price, with _held_cents() from before it
+        self._price = None
+        if self._lists:
+            delta = round(self.price() * 100) - old_cents
+            for key, (ref, count) in list(self._lists.items()):
+                pizzas = ref()
+                if pizzas is None:
+                    del self._lists[key]
+                else:
+                    pizzas._subtotal_cents += delta * count
+
+    @property
+    def size(self) -> str:
+        return self._size.name
+
+    @size.setter
+    def size(self, value: Union[str, Size]) -> None:
+        old_cents = self._held_cents()
+        self._size = Size.parse(value)
+        self._repriced(old_cents)
+
+    @property
+    def base_price(self) -> float:
+        return self._base_price
+
+    @base_price.setter
+    def base_price(self, value: float) -> None:
+        old_cents = self._held_cents()
+        self._base_price = value
+        self._repriced(old_cents)
+
+    @property
+    def extra_cheese(self) -> bool:
+        return self._extra_cheese
+
+    @extra_cheese.setter
+    def extra_cheese(self, value: bool) -> None:
+        old_cents = self._held_cents()
+        self._extra_cheese = value
+        self._repriced(old_cents)
+
+    @property
+    def toppings(self) -> List[str]:
+        return ToppingList(TOPPINGS.names(self._topping_ids), self)
+
+    @toppings.setter
+    def toppings(self, value: Iterable[str]) -> None:
+        self._set_toppings(value)
+
+    def _set_toppings(self, names: Iterable[str]) -> None:
+        old_cents = self._held_cents()
+        self._topping_ids = TOPPINGS.intern(names)
+        self._repriced(old_cents)
+
+    def clone(self) -> 'Pizza':
+        """Every field is immutable (toppings are an interned tuple), so copying the slots is enough."""
+        twin = object.__new__(type(self))
+        twin._lists = None
+        twin.reset(self)
+        return twin
+
+    def reset(self, template: 'Pizza') -> None:
+        """Overwrites this pizza with the state of `template` (used when recycling pooled pizzas)."""
+        old_cents = self._held_cents()
+        self.name = template.name
+        self._size = template._size
+        self._base_price = template._base_price
+        self._topping_ids = template._topping_ids
+        self._extra_cheese = template._extra_cheese
+        self._price = template._price
+        if self._lists:
+            self._repriced(old_cents)
+
+    def __copy__(self) -> 'Pizza':
+        return self.clone()
+
+    def __deepcopy__(self, memo) -> 'Pizza':
+        return self.clone()
+
+    def _key(self) -> tuple:
+        return (self.name, self._size, self._base_price, self._topping_ids, self._extra_cheese)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Pizza):
+            return NotImplemented
+        return self._key() == other._key()
+
+    __hash__ = None  # mutable, like the dataclass it replaces
+
+    def __repr__(self) -> str:
+        return (f"Pizza(name={self.name!r}, size={self.size!r}, base_price={self._base_price!r}, "
+                f"toppings={self.toppings!r}, extra_cheese={self._extra_cheese!r})")
 
     def price(self) -> float:
-        topping_cost = 0.75 * len(self.toppings)
-        cheese_cost = 1.25 if self.extra_cheese else 0.0
-        size_multiplier = {'S': 0.9, 'M': 1.0, 'L': 1.25}[self.size]
-        return round((self.base_price + topping_cost + cheese_cost) * size_multiplier, 2)
+        if self._price is None:
+            topping_cost = 0.75 * len(self._topping_ids)
+            cheese_cost = 1.25 if self._extra_cheese else 0.0
+            size_multiplier = SIZE_MULTIPLIER[self._size]
+            self._price = round((self._base_price + topping_cost + cheese_cost) * size_multiplier, 2)
+        return self._price
 
     def describe(self) -> str:
-        toppings = ', '.join(self.toppings) if self.toppings else 'no extra toppings'
-        cheese = 'with extra cheese' if self.extra_cheese else 'no extra cheese'
+        toppings = ', '.join(TOPPINGS.names(self._topping_ids)) if self._topping_ids else 'no extra toppings'
+        cheese = 'with extra cheese' if self._extra_cheese else 'no extra cheese'
         return f"{self.size}-size {self.name} ({toppings}, {cheese}) -> ${self.price()}"
 
 
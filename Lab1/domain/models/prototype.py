@@ -1,6 +1,6 @@
 from __future__ import annotations
 from copy import deepcopy
-from typing import Dict
+from typing import Dict, List
 from .pizza import Pizza
 
 class PrototypeRegistry:
@@ -11,8 +11,20 @@ class PrototypeRegistry:
     def register(self, key: str, pizza: Pizza) -> None:
         self._registry[key.lower()] = pizza
 
-    def clone(self, key: str) -> Pizza:
+    def _prototype(self, key: str) -> Pizza:
         try:
-            return deepcopy(self._registry[key.lower()])
+            return self._registry[key.lower()]
         except KeyError:
             raise ValueError(f"No prototype registered under '{key}'")
+
+    def clone(self, key: str) -> Pizza:
+        proto = self._prototype(key)
+        # Prototypes that know how to copy themselves skip the generic deepcopy walk.
+        return proto.clone() if hasattr(proto, 'clone') else deepcopy(proto)
+
+    def clone_many(self, key: str, n: int) -> List[Pizza]:
+        proto = self._prototype(key)
+        if hasattr(proto, 'clone'):
+            copy_one = proto.clone
+            return [copy_one() for _ in range(n)]
+        return [deepcopy(proto) for _ in range(n)]
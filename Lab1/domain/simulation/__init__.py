@@ -0,0 +1,8 @@
+from .kitchen import KitchenConfig, KitchenReport, KitchenSimulator, poisson_arrivals
+
+__all__ = [
+    "KitchenConfig",
+    "KitchenReport",
+    "KitchenSimulator",
+    "poisson_arrivals",
+]
@@ -0,0 +1,175 @@
+
+from __future__ import annotations
+import random
+from array import array
+from dataclasses import dataclass, field
+from heapq import heappop, heappush, heapreplace
+from typing import Dict, Iterable, Iterator, Tuple
+from ..models.order_builder import Order
+
+# Minutes of hands-on prep per pizza kind at size 'M'; other sizes scale by SIZE_PREP_FACTOR.
+DEFAULT_PREP_MINUTES = {'margherita': 3.0, 'pepperoni': 3.5, 'veggie': 4.5}
+SIZE_PREP_FACTOR = {'S': 0.8, 'M': 1.0, 'L': 1.3}
+DEFAULT_BAKE_MINUTES = {'S': 6.0, 'M': 8.0, 'L': 10.0}
+
+
+def _default_prep_table() -> Dict[Tuple[str, str], float]:
+    return {(kind, size): minutes * factor
+            for kind, minutes in DEFAULT_PREP_MINUTES.items()
+            for size, factor in SIZE_PREP_FACTOR.items()}
+
+
+@dataclass
+class KitchenConfig:
+    staff: int = 4
+    ovens: int = 2  # pizzas that can bake at the same time
+    prep_minutes: Dict[Tuple[str, str], float] = field(default_factory=_default_prep_table)
+    bake_minutes: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_BAKE_MINUTES))
+    default_prep_minutes: float = 4.0
+
+
+@dataclass
+class KitchenReport:
+    orders: int
+    pizzas: int
+    sim_minutes: float
+    throughput_per_hour: float
+    avg_prep_queue: float
+    max_prep_queue: int
+    avg_oven_queue: float
+    max_oven_queue: int
+    p50_latency: float
+    p95_latency: float
+    max_latency: float
+
+    def summary(self) -> str:
+        return (f"Orders: {self.orders} ({self.pizzas} pizzas) over {self.sim_minutes / 60:.1f} h\n"
+                f"Throughput: {self.throughput_per_hour:.1f} orders/h\n"
+                f"Prep queue: avg {self.avg_prep_queue:.2f}, max {self.max_prep_queue}\n"
+                f"Oven queue: avg {self.avg_oven_queue:.2f}, max {self.max_oven_queue}\n"
+                f"Order latency: p50 {self.p50_latency:.1f} min, p95 {self.p95_latency:.1f} min, "
+                f"max {self.max_latency:.1f} min")
+
+
+def poisson_arrivals(orders: Iterable[Order], orders_per_hour: float,
+                     seed: int = 0) -> Iterator[Tuple[float, Order]]:
+    """Stamps a stream of orders with Poisson arrival times (in minutes)."""
+    rng = random.Random(seed)
+    rate = orders_per_hour / 60.0
+    t = 0.0
+    for order in orders:
+        t += rng.expovariate(rate)
+        yield t, order
+
+
+def _percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class KitchenSimulator:
+    """Discrete-event simulation of a two-stage kitchen: cooks prep pizzas, ovens bake them.
+
+    Both stages serve FIFO. Free times of cooks and ovens live in min-heaps, and pizzas leaving
+    prep wait in an event heap keyed by ready time. An oven event is only handled once the
+    arrival stream has moved past it, so no earlier event can still appear; the stream is
+    consumed lazily and memory stays proportional to the work in flight.
+    """
+    def __init__(self, config: KitchenConfig = None):
+        self.config = config or KitchenConfig()
+
+    def run(self, arrivals: Iterable[Tuple[float, Order]]) -> KitchenReport:
+        cfg = self.config
+        if cfg.staff < 1 or cfg.ovens < 1:
+            raise ValueError("Kitchen needs at least one cook and one oven")
+        job_times: Dict[Tuple[str, str], Tuple[float, float]] = {}
+
+        cooks = [0.0] * cfg.staff          # time each cook becomes free
+        ovens = [0.0] * cfg.ovens          # time each oven slot becomes free
+        oven_events: list = []             # (ready_time, seq, bake_minutes, order_slot)
+        prep_waiting: list = []            # start times of pizzas still queued for a cook
+        oven_waiting: list = []            # start times of pizzas still queued for an oven
+        open_orders: Dict[int, list] = {}  # slot -> [pizzas_left, arrival, finish]
+        latencies = array('d')
+
+        orders = pizzas = seq = 0
+        prep_queue_sum = oven_queue_sum = 0
+        max_prep_queue = max_oven_queue = 0
+        last_arrival = 0.0
+        last_done = 0.0
+
+        def drain_ovens(until: float) -> None:
+            nonlocal oven_queue_sum, max_oven_queue, last_done
+            while oven_events and oven_events[0][0] <= until:
+                ready, _, bake, slot = heappop(oven_events)
+                start = ovens[0] if ovens[0] > ready else ready
+                done = start + bake
+                heapreplace(ovens, done)
+                while oven_waiting and oven_waiting[0] <= ready:
+                    heappop(oven_waiting)
+                queued = len(oven_waiting)
+                oven_queue_sum += queued
+                if queued > max_oven_queue:
+                    max_oven_queue = queued
+                if start > ready:
+                    heappush(oven_waiting, start)
+                state = open_orders[slot]
+                state[0] -= 1
+                if done > state[2]:
+                    state[2] = done
+                if state[0] == 0:
+                    latencies.append(state[2] - state[1])
+                    if state[2] > last_done:
+                        last_done = state[2]
+                    del open_orders[slot]
+
+        for arrival, order in arrivals:
+            if arrival < last_arrival:
+                raise ValueError("Orders must arrive in non-decreasing time order")
+            last_arrival = arrival
+            drain_ovens(arrival)
+            orders += 1
+            if not order.pizzas:
+                latencies.append(0.0)
+                continue
+            open_orders[orders] = [len(order.pizzas), arrival, arrival]
+            while prep_waiting and prep_waiting[0] <= arrival:
+                heappop(prep_waiting)
+            for pizza in order.pizzas:
+                key = (pizza.name, pizza.size)
+                times = job_times.get(key)
+                if times is None:
+                    prep = cfg.prep_minutes.get((pizza.name.lower(), pizza.size), cfg.default_prep_minutes)
+                    times = job_times[key] = (prep, cfg.bake_minutes[pizza.size])
+                queued = len(prep_waiting)
+                prep_queue_sum += queued
+                if queued > max_prep_queue:
+                    max_prep_queue = queued
+                start = cooks[0] if cooks[0] > arrival else arrival
+                ready = start + times[0]
+                heapreplace(cooks, ready)
+                if start > arrival:
+                    heappush(prep_waiting, start)
+                seq += 1
+                heappush(oven_events, (ready, seq, times[1], orders))
+            pizzas += len(order.pizzas)
+
+        drain_ovens(float('inf'))
+
+        ordered = sorted(latencies)
+        horizon = max(last_done, last_arrival)
+        return KitchenReport(
+            orders=orders,
+            pizzas=pizzas,
+            sim_minutes=horizon,
+            throughput_per_hour=orders / horizon * 60 if horizon else 0.0,
+            avg_prep_queue=prep_queue_sum / pizzas if pizzas else 0.0,
+            max_prep_queue=max_prep_queue,
+            avg_oven_queue=oven_queue_sum / pizzas if pizzas else 0.0,
+            max_oven_queue=max_oven_queue,
+            p50_latency=_percentile(ordered, 50),
+            p95_latency=_percentile(ordered, 95),
+            max_latency=ordered[-1] if ordered else 0.0,
+        )
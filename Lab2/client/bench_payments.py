@@ -0,0 +1,81 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+from domain.adapter import BatchingPaymentAdapter, ModernPaymentSystemInterface, PaymentAdapter
+from domain.models import Order
+
+class StubConnection:
+    def __init__(self, connect_cost: float):
+        time.sleep(connect_cost)  # TCP + TLS handshake
+        self.requests = 0
+
+class StubPaymentGateway(ModernPaymentSystemInterface):
+    """Local stand-in for a payment gateway that accepts at most `max_connections` at once.
+
+    Single payments open a fresh connection each time; batches reuse pooled connections.
+    Every request pays a fixed round-trip cost plus a small per-payment cost.
+    """
+    def __init__(self, connect_cost: float = 0.002, request_cost: float = 0.003,
+                 per_payment_cost: float = 0.00005, max_connections: int = 4):
+        self.connect_cost = connect_cost
+        self.request_cost = request_cost
+        self.per_payment_cost = per_payment_cost
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._pool: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+        self.requests = 0
+
+    def _connect(self) -> StubConnection:
+        with self._lock:
+            self.connections_opened += 1
+        return StubConnection(self.connect_cost)
+
+    def _send(self, conn: StubConnection, n: int):
+        with self._lock:
+            self.requests += 1
+        conn.requests += 1
+        time.sleep(self.request_cost + self.per_payment_cost * n)
+
+    def process_payment(self, order: Order, payment_method: str) -> bool:
+        with self._slots:
+            self._send(self._connect(), 1)
+        return order.total_amount > 0
+
+    def process_payments(self, orders: List[Order], payment_method: str) -> List[bool]:
+        with self._slots:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            self._send(conn, len(orders))
+            self._pool.put(conn)
+        return [order.total_amount > 0 for order in orders]
+
+PAYMENTS = 2000
+CALLERS = 64
+
+def run(label: str, adapter, gateway: StubPaymentGateway):
+    amounts = [10.0 + i % 50 for i in range(PAYMENTS)]
+    amounts[7] = 0.0  # one declined payment must come back to its own caller
+    start = time.perf_counter()
+    with ThreadPoolExecutor(CALLERS) as pool:
+        results = list(pool.map(lambda a: adapter.process_payment_legacy(a, "USD"), amounts))
+    elapsed = time.perf_counter() - start
+    assert results == [a > 0 for a in amounts]
+    print(f"{label:<20} {PAYMENTS / elapsed:8.0f} payments/s   {gateway.requests:5d} requests   "
+          f"{gateway.connections_opened:5d} connections opened")
+
+def main():
+    print(f"=== {PAYMENTS} legacy payments from {CALLERS} concurrent callers ===")
+    gateway = StubPaymentGateway()
+    run("PaymentAdapter", PaymentAdapter(gateway), gateway)
+    gateway = StubPaymentGateway()
+    batching = BatchingPaymentAdapter(gateway, max_batch=64, max_wait=0.002)
+    run("BatchingAdapter", batching, gateway)
+    batching.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import time
+from domain.decorator import LoggingDecorator, OrderProcessor, ValidationDecorator
+from domain.models import Order, Product
+from domain.pipeline import compile_pipeline
+from domain.sink import EventSink
+
+ORDERS = 20000
+
+class NullSink(EventSink):
+    def emit(self, message: str):
+        pass
+
+class NoOpProcessor(OrderProcessor):
+    def process_order(self, order: Order) -> bool:
+        return True
+
+class QuietValidation(ValidationDecorator):
+    def before(self, order: Order) -> bool:
+        return bool(order.items) and order.total_amount > 0
+
+def nested_stack(depth: int) -> OrderProcessor:
+    sink = NullSink()
+    processor = NoOpProcessor()
+    for i in range(depth):
+        processor = QuietValidation(processor) if i % 2 else LoggingDecorator(processor, sink)
+    return processor
+
+def per_order_us(processor: OrderProcessor, order: Order, repeats: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(ORDERS):
+            processor.process_order(order)
+        best = min(best, time.perf_counter() - start)
+    return best / ORDERS * 1e6
+
+def main():
+    order = Order("BENCH")
+    order.add_item(Product("1", "Laptop", 999.99, "Electronics"), 1)
+    print(f"=== Per-order overhead vs. stack depth ({ORDERS} orders, best of 5) ===")
+    print(f"{'depth':>5} {'nested':>10} {'compiled':>10}")
+    for depth in (1, 3, 5, 10, 20, 40):
+        nested = per_order_us(nested_stack(depth), order)
+        compiled = per_order_us(compile_pipeline(nested_stack(depth)), order)
+        print(f"{depth:>5} {nested:>8.2f}us {compiled:>8.2f}us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import contextlib
+import io
+import time
+from domain.decorator import BasicOrderProcessor, ValidationDecorator, LoggingDecorator, EmailNotificationDecorator
+from domain.models import Order, Product
+from domain.sink import QueuedSink, WriterSink
+
+ORDERS = 5000
+WRITE_COST = 0.0002  # simulated stdout / mail I/O per write call
+
+def slow_writer(messages):
+    time.sleep(WRITE_COST)
+
+def build_stack(log_sink, email_sink):
+    return EmailNotificationDecorator(
+        LoggingDecorator(ValidationDecorator(BasicOrderProcessor()), log_sink),
+        email_sink,
+    )
+
+def measure(label, log_sink, email_sink):
+    processor = build_stack(log_sink, email_sink)
+    product = Product("1", "Laptop", 999.99, "Electronics")
+    latencies = []
+    with contextlib.redirect_stdout(io.StringIO()):  # keep the undecorated prints out of the numbers
+        for i in range(ORDERS):
+            order = Order(f"ORD-{i}")
+            order.add_item(product, 1)
+            start = time.perf_counter()
+            processor.process_order(order)
+            latencies.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        for sink in {log_sink, email_sink}:
+            sink.close()
+        shutdown = time.perf_counter() - start
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1e6
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e6
+    print(f"{label:<26} p50 {p50:8.1f} us   p99 {p99:8.1f} us   flush on close {shutdown * 1000:6.1f} ms")
+
+def main():
+    print(f"=== process_order latency, {ORDERS} orders, {WRITE_COST * 1e6:.0f} us per sink write ===")
+    writer = WriterSink(slow_writer)
+    measure("inline sink", writer, writer)
+    queued = QueuedSink(slow_writer, maxsize=100_000)
+    measure("queued sink (block)", queued, queued)
+    dropping = QueuedSink(slow_writer, maxsize=1000, overflow="drop")
+    measure("queued sink (drop)", dropping, dropping)
+    print(f"  dropped {dropping.dropped} of {dropping.dropped + dropping.written} events")
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
+import threading
 from abc import ABC, abstractmethod
+from typing import List
 from .models import LegacyPaymentSystem, Order
 
 # Service Interface
@@ -7,6 +9,10 @@ class ModernPaymentSystemInterface(ABC):
     def process_payment(self, order: Order, payment_method: str) -> bool:
         pass
 
+    def process_payments(self, orders: List[Order], payment_method: str) -> List[bool]:
+        """Batch entry point; systems with a real batch API should override it"""
+        return [self.process_payment(order, payment_method) for order in orders]
+
 class ModernPaymentSystem(ModernPaymentSystemInterface):
     """Modern payment system with different interface"""
     def process_payment(self, order: Order, payment_method: str) -> bool:
@@ -26,4 +32,81 @@ class PaymentAdapter(LegacyPaymentSystem):
         # Convert legacy parameters to modern format
         payment_method = "credit_card"  # Default for legacy system
         
-        return self.modern_system.process_payment(temp_order, payment_method)
\ No newline at end of file
+        return self.modern_system.process_payment(temp_order, payment_method)
+
+class _PendingPayment:
+    def __init__(self, order: Order):
+        self.order = order
+        self.done = threading.Event()
+        self.result = False
+        self.error = None
+
+class BatchingPaymentAdapter(LegacyPaymentSystem):
+    """Adapter that coalesces concurrent legacy payments into batch calls.
+
+    Calls are collected until `max_batch` are waiting or `max_wait` seconds have passed since
+    the first one, then sent as one process_payments() call. Each caller blocks until its own
+    result is back; a failed batch call raises in every caller of that batch.
+    """
+    def __init__(self, modern_system: ModernPaymentSystemInterface, max_batch: int = 64,
+                 max_wait: float = 0.005, payment_method: str = "credit_card"):
+        self.modern_system = modern_system
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.payment_method = payment_method
+        self._pending: List[_PendingPayment] = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self.batches = 0
+        self._flusher = threading.Thread(target=self._run, name="payment-batcher", daemon=True)
+        self._flusher.start()
+
+    def process_payment_legacy(self, amount: float, currency: str) -> bool:
+        temp_order = Order("temp")
+        temp_order.total_amount = amount
+        pending = _PendingPayment(temp_order)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Adapter is closed")
+            self._pending.append(pending)
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch:
+                self._cond.notify()
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _take_batch(self) -> List[_PendingPayment]:
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            if not self._pending:
+                return []
+            # first call opens the window; wait for it to fill or time out
+            self._cond.wait_for(lambda: len(self._pending) >= self.max_batch or self._closed, self.max_wait)
+            batch = self._pending[:self.max_batch]
+            del self._pending[:self.max_batch]
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return
+            self.batches += 1
+            try:
+                results = self.modern_system.process_payments([p.order for p in batch], self.payment_method)
+                for pending, result in zip(batch, results):
+                    pending.result = result
+            except Exception as e:
+                for pending in batch:
+                    pending.error = e
+            for pending in batch:
+                pending.done.set()
+
+    def close(self):
+        """Sends whatever is still queued, then stops the batching thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._flusher.join()
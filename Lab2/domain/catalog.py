@@ -0,0 +1,220 @@
+import csv
+import mmap
+import struct
+import zlib
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, Iterator, List
+from .models import Product
+
+# Catalog subsystem: id, category and price indexes over the product list
+class Catalog(ABC):
+    @abstractmethod
+    def get(self, product_id: str) -> Product:
+        """Returns the product or raises KeyError"""
+
+    @abstractmethod
+    def by_category(self, category: str) -> List[Product]:
+        pass
+
+    @abstractmethod
+    def price_range(self, low: float, high: float) -> List[Product]:
+        """Products with low <= price <= high, cheapest first"""
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[Product]:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+class ProductCatalog(Catalog):
+    """In-memory catalog with a hash index by id, a category index and a sorted price index"""
+    def __init__(self, products: Iterable[Product] = ()):
+        self._by_id: Dict[str, Product] = {}
+        self._by_category: Dict[str, List[Product]] = {}
+        self._prices: List[float] = []
+        self._by_price: List[Product] = []
+        for product in products:
+            self._by_id[product.id] = product
+        # bulk load: index everything in one pass and sort once
+        for product in self._by_id.values():
+            self._by_category.setdefault(product.category, []).append(product)
+        self._by_price = sorted(self._by_id.values(), key=lambda p: p.price)
+        self._prices = [p.price for p in self._by_price]
+
+    @classmethod
+    def from_csv(cls, path: str) -> "ProductCatalog":
+        """Reads rows of id,name,price,category (a header row is optional)"""
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = [r for r in csv.reader(f) if r and r[0] != "id"]
+        return cls(Product(pid, name, float(price), category) for pid, name, price, category in rows)
+
+    def add(self, product: Product):
+        if product.id in self._by_id:
+            self.remove(product.id)
+        self._by_id[product.id] = product
+        self._by_category.setdefault(product.category, []).append(product)
+        i = bisect_right(self._prices, product.price)
+        self._prices.insert(i, product.price)
+        self._by_price.insert(i, product)
+
+    def remove(self, product_id: str):
+        product = self._by_id.pop(product_id)
+        self._by_category[product.category].remove(product)
+        i = bisect_left(self._prices, product.price)
+        while self._by_price[i] is not product:
+            i += 1
+        del self._prices[i]
+        del self._by_price[i]
+
+    def get(self, product_id: str) -> Product:
+        return self._by_id[product_id]
+
+    def by_category(self, category: str) -> List[Product]:
+        return list(self._by_category.get(category, ()))
+
+    def price_range(self, low: float, high: float) -> List[Product]:
+        return self._by_price[bisect_left(self._prices, low):bisect_right(self._prices, high)]
+
+    def __iter__(self) -> Iterator[Product]:
+        return iter(self._by_id.values())
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def save_snapshot(self, path: str):
+        write_snapshot(self, path)
+
+# Binary snapshot layout (little endian), every section starting on an 8-byte boundary:
+#   header   magic, record count, hash slots, category count, padding, section offsets (64 bytes)
+#   prices   float64 per record, records sorted by price
+#   offsets  uint32 per record + 1 into the string blob
+#   blob     "id\x1fname\x1fcategory" per record, utf-8
+#   hash     uint32 slots holding record index + 1 (0 = empty), open addressing on crc32(id)
+#   cats     per category: uint16 name length, name, padding to 4 bytes, uint32 count, uint32 record indexes
+_MAGIC = b"PCATv2\0\0"
+_HEADER = struct.Struct("<8s3I4x5Q")
+_SEP = "\x1f"
+
+def _slot(product_id: str, slots: int) -> int:
+    return zlib.crc32(product_id.encode("utf-8")) % slots
+
+def _aligned(offset: int, alignment: int = 8) -> int:
+    return offset + (-offset % alignment)
+
+def write_snapshot(catalog: Catalog, path: str):
+    products = sorted(catalog, key=lambda p: p.price)
+    n = len(products)
+    slots = max(8, n * 2)
+
+    blob = bytearray()
+    offsets = [0]
+    for p in products:
+        blob += _SEP.join((p.id, p.name, p.category)).encode("utf-8")
+        offsets.append(len(blob))
+
+    table = [0] * slots
+    for index, p in enumerate(products):
+        s = _slot(p.id, slots)
+        while table[s]:
+            s = (s + 1) % slots
+        table[s] = index + 1
+
+    prices_at = _HEADER.size
+    offsets_at = _aligned(prices_at + 8 * n)
+    blob_at = _aligned(offsets_at + 4 * (n + 1))
+    hash_at = _aligned(blob_at + len(blob))
+    cats_at = _aligned(hash_at + 4 * slots)
+
+    categories: Dict[str, List[int]] = {}
+    for index, p in enumerate(products):
+        categories.setdefault(p.category, []).append(index)
+    cats = bytearray()
+    for name, indexes in categories.items():
+        encoded = name.encode("utf-8")
+        cats += struct.pack(f"<H{len(encoded)}s", len(encoded), encoded)
+        cats += b"\0" * (_aligned(cats_at + len(cats), 4) - cats_at - len(cats))
+        cats += struct.pack(f"<I{len(indexes)}I", len(indexes), *indexes)
+
+    def write_at(f, offset: int, data: bytes):
+        f.write(b"\0" * (offset - f.tell()))
+        f.write(data)
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, n, slots, len(categories), prices_at, offsets_at, blob_at, hash_at, cats_at))
+        write_at(f, prices_at, struct.pack(f"<{n}d", *(p.price for p in products)))
+        write_at(f, offsets_at, struct.pack(f"<{n + 1}I", *offsets))
+        write_at(f, blob_at, blob)
+        write_at(f, hash_at, struct.pack(f"<{slots}I", *table))
+        write_at(f, cats_at, cats)
+
+class SnapshotCatalog(Catalog):
+    """Read-only catalog served straight from a memory-mapped snapshot.
+
+    Opening only maps the file and reads the small category table; products are decoded on access.
+    """
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, n, slots, n_cats, prices_at, offsets_at, blob_at, hash_at, cats_at = _HEADER.unpack_from(self._mm)
+        if magic != _MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path} is not a catalog snapshot")
+        self._view = view = memoryview(self._mm)
+        self._n = n
+        self._slots = slots
+        self._prices = view[prices_at:prices_at + 8 * n].cast("d")
+        self._offsets = view[offsets_at:offsets_at + 4 * (n + 1)].cast("I")
+        self._blob_at = blob_at
+        self._hash = view[hash_at:hash_at + 4 * slots].cast("I")
+        self._categories: Dict[str, memoryview] = {}
+        pos = cats_at
+        for _ in range(n_cats):
+            (length,) = struct.unpack_from("<H", self._mm, pos)
+            name = bytes(self._mm[pos + 2:pos + 2 + length]).decode("utf-8")
+            pos = _aligned(pos + 2 + length, 4)
+            (count,) = struct.unpack_from("<I", self._mm, pos)
+            start = pos + 4
+            self._categories[name] = view[start:start + 4 * count].cast("I")
+            pos = start + 4 * count
+
+    def _record(self, index: int) -> Product:
+        start = self._blob_at + self._offsets[index]
+        end = self._blob_at + self._offsets[index + 1]
+        pid, name, category = self._mm[start:end].decode("utf-8").split(_SEP)
+        return Product(pid, name, self._prices[index], category)
+
+    def get(self, product_id: str) -> Product:
+        s = _slot(product_id, self._slots)
+        while self._hash[s]:
+            product = self._record(self._hash[s] - 1)
+            if product.id == product_id:
+                return product
+            s = (s + 1) % self._slots
+        raise KeyError(product_id)
+
+    def by_category(self, category: str) -> List[Product]:
+        return [self._record(i) for i in self._categories.get(category, ())]
+
+    def price_range(self, low: float, high: float) -> List[Product]:
+        return [self._record(i) for i in range(bisect_left(self._prices, low), bisect_right(self._prices, high))]
+
+    def __iter__(self) -> Iterator[Product]:
+        return (self._record(i) for i in range(self._n))
+
+    def __len__(self) -> int:
+        return self._n
+
+    def close(self):
+        for view in (self._prices, self._offsets, self._hash, *self._categories.values(), self._view):
+            view.release()
+        self._categories.clear()
+        self._mm.close()
+
+def load_catalog(path: str) -> Catalog:
+    """Opens a .csv product list or a binary snapshot written by write_snapshot"""
+    if path.endswith(".csv"):
+        return ProductCatalog.from_csv(path)
+    return SnapshotCatalog(path)
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 from .models import Order
+from .outbox import EmailOutbox
+from .sink import EventSink, PrintSink
 
 # Component Interface
 class OrderProcessor(ABC):
@@ -15,15 +17,30 @@ class BasicOrderProcessor(OrderProcessor):
 
 # Base Decorator
 class OrderProcessorDecorator(OrderProcessor):
+    """Decorators add behaviour through two hooks: before() runs on the way in and can stop
+    the order by returning False, after() runs on the way out and may change the result.
+    Hook-based decorators can be flattened by domain.pipeline.compile_pipeline."""
     def __init__(self, processor: OrderProcessor):
         self._processor = processor
-    
+
+    @property
+    def wrapped(self) -> OrderProcessor:
+        return self._processor
+
+    def before(self, order: Order) -> bool:
+        return True
+
+    def after(self, order: Order, result: bool) -> bool:
+        return result
+
     def process_order(self, order: Order) -> bool:
-        return self._processor.process_order(order)
+        if not self.before(order):
+            return False
+        return self.after(order, self._processor.process_order(order))
 
 # Concrete Decorators
 class ValidationDecorator(OrderProcessorDecorator):
-    def process_order(self, order: Order) -> bool:
+    def before(self, order: Order) -> bool:
         if not order.items:
             print("Validation failed: Order has no items")
             return False
@@ -33,18 +50,30 @@ class ValidationDecorator(OrderProcessorDecorator):
             return False
         
         print("Order validation passed")
-        return super().process_order(order)
+        return True
 
 class LoggingDecorator(OrderProcessorDecorator):
-    def process_order(self, order: Order) -> bool:
-        print(f"LOG: Starting to process order {order.order_id}")
-        result = super().process_order(order)
-        print(f"LOG: Order {order.order_id} processing {'completed' if result else 'failed'}")
+    def __init__(self, processor: OrderProcessor, sink: EventSink = None):
+        super().__init__(processor)
+        self._sink = sink or PrintSink()
+
+    def before(self, order: Order) -> bool:
+        self._sink.emit(f"LOG: Starting to process order {order.order_id}")
+        return True
+
+    def after(self, order: Order, result: bool) -> bool:
+        self._sink.emit(f"LOG: Order {order.order_id} processing {'completed' if result else 'failed'}")
         return result
 
 class EmailNotificationDecorator(OrderProcessorDecorator):
-    def process_order(self, order: Order) -> bool:
-        result = super().process_order(order)
+    def __init__(self, processor: OrderProcessor, sink: EventSink = None, outbox: EmailOutbox = None):
+        super().__init__(processor)
+        self._sink = sink or PrintSink()
+        self._outbox = outbox  # when set, confirmations are queued as real emails as well
+
+    def after(self, order: Order, result: bool) -> bool:
         if result:
-            print(f"EMAIL: Order confirmation sent for order {order.order_id}")
-        return result
\ No newline at end of file
+            if self._outbox is not None:
+                self._outbox.enqueue(order.order_id, order.status, [f"Order {order.order_id} confirmed"])
+            self._sink.emit(f"EMAIL: Order confirmation sent for order {order.order_id}")
+        return result
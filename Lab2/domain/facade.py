@@ -1,41 +1,50 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Tuple
 from .models import Order, Product, OldPaymentProcessor
+from .catalog import Catalog, ProductCatalog
+from .proxy import IdempotentPaymentProxy
 from .adapter import ModernPaymentSystem, ModernPaymentSystemInterface, PaymentAdapter
 from .decorator import BasicOrderProcessor, ValidationDecorator, LoggingDecorator, EmailNotificationDecorator
 
 class ECommerceFacade:
     """Facade that simplifies the complex e-commerce system"""
     
-    def __init__(self):
-        self.products = [
-            Product("1", "Laptop", 999.99, "Electronics"),
-            Product("2", "Book", 19.99, "Education"),
-            Product("3", "Headphones", 149.99, "Electronics")
-        ]
+    def __init__(self, catalog: Catalog = None):
+        if catalog is None:  # an empty catalog is falsy, but still the caller's choice
+            catalog = ProductCatalog([
+                Product("1", "Laptop", 999.99, "Electronics"),
+                Product("2", "Book", 19.99, "Education"),
+                Product("3", "Headphones", 149.99, "Electronics")
+            ])
+        self.catalog = catalog
         
         # Set up the decorated order processor
         basic_processor = BasicOrderProcessor()
-        decorated_processor = EmailNotificationDecorator(
+        self.order_processor = EmailNotificationDecorator(
             LoggingDecorator(
                 ValidationDecorator(basic_processor)
             )
         )
-        self.order_processor = decorated_processor
         
         # Set up payment system with adapter
         self.modern_payment_system: ModernPaymentSystemInterface = ModernPaymentSystem()
         self.payment_adapter = PaymentAdapter(self.modern_payment_system)
+        # Retried orders reuse the first payment outcome instead of paying twice
+        self.payments = IdempotentPaymentProxy(self.payment_adapter)
     
     def get_products(self) -> list:
-        return self.products
+        return list(self.catalog)
     
     def create_order(self, order_id: str) -> Order:
         return Order(order_id)
     
     def find_product(self, product_id: str) -> Product:
-        for product in self.products:
-            if product.id == product_id:
-                return product
-        raise ValueError(f"Product {product_id} not found")
+        try:
+            return self.catalog.get(product_id)
+        except KeyError:
+            raise ValueError(f"Product {product_id} not found")
     
     def process_complete_order(self, order: Order) -> bool:
         """Facade method that handles the entire order process"""
@@ -46,9 +55,64 @@ class ECommerceFacade:
             return False
         
         # Process payment using adapter
-        if not self.payment_adapter.process_payment_legacy(order.total_amount, "USD"):
+        if not self.payments.pay(order.order_id, order.total_amount, "USD"):
             print("Payment failed")
             return False
         
         print(f"=== Order {order.order_id} completed successfully ===")
-        return True
\ No newline at end of file
+        return True
+
+    def _process_one(self, order: Order) -> Tuple[Order, bool]:
+        try:
+            return order, self.process_complete_order(order)
+        except Exception as e:
+            print(f"Order {order.order_id} failed: {e}")
+            return order, False
+
+    def process_orders(self, orders: Iterable[Order], max_workers: int = 8,
+                       max_pending: int = None) -> Iterator[Tuple[Order, bool]]:
+        """Processes many orders concurrently, yielding (order, success) as each one finishes.
+
+        Every order still goes through validation, processing and payment in that order.
+        The input is read on a feeder thread that keeps at most `max_pending` orders in
+        flight, so a large or slow stream is consumed at the pace the workers can handle
+        while finished orders are handed back without waiting for the next input.
+        """
+        max_pending = max_pending or 2 * max_workers
+        results: queue.Queue = queue.Queue()
+        slots = threading.BoundedSemaphore(max_pending)
+        stop = threading.Event()
+        end = object()
+
+        def finished(future):
+            slots.release()
+            results.put(future.result())  # _process_one never raises
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="orders") as pool:
+            def feed():
+                submitted, error = 0, None
+                try:
+                    for order in orders:
+                        slots.acquire()
+                        if stop.is_set():
+                            break
+                        pool.submit(self._process_one, order).add_done_callback(finished)
+                        submitted += 1
+                except Exception as e:  # a failing input stream is re-raised to the caller
+                    error = e
+                results.put((end, submitted, error))
+
+            threading.Thread(target=feed, name="orders-feed", daemon=True).start()
+            yielded, total, error = 0, None, None
+            try:
+                while total is None or yielded < total:
+                    item = results.get()
+                    if item[0] is end:
+                        _, total, error = item
+                        continue
+                    yielded += 1
+                    yield item
+            finally:
+                stop.set()
+            if error is not None:
+                raise error
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
+from array import array
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, Iterator, List, TextIO, Tuple
 
 @dataclass
 class Product:
@@ -14,21 +15,117 @@ class OrderItem:
     product: Product
     quantity: int
 
+def to_cents(amount: float) -> int:
+    return round(amount * 100)
+
+def format_cents(cents: int) -> str:
+    return f"${cents // 100}.{cents % 100:02d}"
+
+class OrderLines:
+    """Line store keyed by product id.
+
+    Quantities and unit prices (integer cents) live in array-backed columns; a repeated
+    product merges into its existing row, and removal swaps the last row into the gap,
+    so every update is O(1) and the total is exact.
+    """
+    def __init__(self):
+        self._rows: Dict[str, int] = {}
+        self._products: List[Product] = []
+        self._qty = array("q")
+        self._unit_cents = array("q")
+        self.total_cents = 0
+
+    def add(self, product: Product, quantity: int):
+        row = self._rows.get(product.id)
+        cents = to_cents(product.price)
+        if row is None:
+            self._rows[product.id] = len(self._products)
+            self._products.append(product)
+            self._qty.append(quantity)
+            self._unit_cents.append(cents)
+        else:
+            if self._unit_cents[row] != cents:
+                raise ValueError(f"Product {product.id} is already in the order at a different price")
+            self._qty[row] += quantity
+        self.total_cents += cents * quantity
+
+    def set_quantity(self, product_id: str, quantity: int):
+        if quantity <= 0:
+            self.remove(product_id)
+            return
+        row = self._rows[product_id]
+        self.total_cents += (quantity - self._qty[row]) * self._unit_cents[row]
+        self._qty[row] = quantity
+
+    def remove(self, product_id: str):
+        row = self._rows.pop(product_id)
+        self.total_cents -= self._qty[row] * self._unit_cents[row]
+        last = len(self._products) - 1
+        if row != last:
+            moved = self._products[last]
+            self._products[row] = moved
+            self._qty[row] = self._qty[last]
+            self._unit_cents[row] = self._unit_cents[last]
+            self._rows[moved.id] = row
+        self._products.pop()
+        self._qty.pop()
+        self._unit_cents.pop()
+
+    def quantity_of(self, product_id: str) -> int:
+        row = self._rows.get(product_id)
+        return self._qty[row] if row is not None else 0
+
+    def rows(self) -> Iterator[Tuple[Product, int, int]]:
+        """(product, quantity, line total in cents) per line"""
+        for product, qty, cents in zip(self._products, self._qty, self._unit_cents):
+            yield product, qty, qty * cents
+
+    def __iter__(self) -> Iterator[OrderItem]:
+        return (OrderItem(product, qty) for product, qty in zip(self._products, self._qty))
+
+    def __len__(self) -> int:
+        return len(self._products)
+
 class Order:
     def __init__(self, order_id: str):
         self.order_id = order_id
-        self.items: List[OrderItem] = []
+        self.lines = OrderLines()
         self.total_amount = 0.0
         self.status = "Pending"
-    
+
+    @property
+    def items(self) -> OrderLines:
+        return self.lines
+
+    @property
+    def total_cents(self) -> int:
+        return self.lines.total_cents
+
     def add_item(self, product: Product, quantity: int):
-        self.items.append(OrderItem(product, quantity))
-        self.total_amount += product.price * quantity
-    
+        self.lines.add(product, quantity)
+        self.total_amount = self.lines.total_cents / 100
+
+    def update_quantity(self, product_id: str, quantity: int):
+        self.lines.set_quantity(product_id, quantity)
+        self.total_amount = self.lines.total_cents / 100
+
+    def remove_item(self, product_id: str):
+        self.lines.remove(product_id)
+        self.total_amount = self.lines.total_cents / 100
+
+    def render(self) -> Iterator[str]:
+        """Yields the printable order piece by piece, so large orders never build one big string"""
+        yield f"Order {self.order_id} (Status: {self.status})\nItems:\n"
+        for product, qty, cents in self.lines.rows():
+            yield f"  - {product.name} x {qty}: {format_cents(cents)}\n"
+        yield f"Total: ${self.total_amount:.2f}"
+
+    def write_to(self, stream: TextIO):
+        for chunk in self.render():
+            stream.write(chunk)
+
     def __str__(self):
-        items_str = "\n".join([f"  - {item.product.name} x {item.quantity}: ${item.product.price * item.quantity:.2f}" 
-                             for item in self.items])
-        return f"Order {self.order_id} (Status: {self.status})\nItems:\n{items_str}\nTotal: ${self.total_amount:.2f}"
+        return "".join(self.render())
 
 # Legacy system interface (Client Interface)
 class LegacyPaymentSystem(ABC):
@@ -0,0 +1,95 @@
+import smtplib
+import threading
+import time
+from email.message import EmailMessage
+from typing import Callable, Dict, List, Optional
+
+class EmailOutbox:
+    """Queues order emails and sends them in batches over one SMTP connection.
+
+    The facade confirms every order once, so emails are simply queued in order. enqueue()
+    never touches the network: a background sender sends once `batch_size` emails are
+    waiting, or whatever is waiting every `flush_interval` seconds. A failed batch stays
+    queued and is retried; the sender only counts the failure. flush() sends on the calling
+    thread and does raise; close() stops the sender and flushes what is left.
+    """
+    def __init__(self, host: str = "localhost", port: int = 25, sender: str = "orders@example.com",
+                 batch_size: int = 100, flush_interval: float = 1.0, recipient_for: Callable[[str], str] = None,
+                 connect: Callable[[], smtplib.SMTP] = None):
+        self.sender = sender
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._recipient_for = recipient_for or (lambda order_id: f"customer+{order_id}@example.com")
+        self._connect = connect or (lambda: smtplib.SMTP(host, port, local_hostname="localhost", timeout=10))
+        self._pending: List[EmailMessage] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._send_lock = threading.Lock()
+        self._closed = False
+        self.sent = 0
+        self.failed = 0
+        self.last_error: Optional[Exception] = None
+        self._sender = threading.Thread(target=self._send_loop, name="email-outbox", daemon=True)
+        self._sender.start()
+
+    def enqueue(self, order_id: str, status: str, lines: List[str]):
+        msg = EmailMessage()
+        msg["From"] = self.sender
+        msg["To"] = self._recipient_for(order_id)
+        msg["Subject"] = f"Order {order_id}: {status}"
+        msg.set_content("\n".join(lines) + "\n")
+        with self._lock:
+            self._pending.append(msg)
+            if len(self._pending) >= self.batch_size:
+                self._wake.notify()
+
+    def _send_loop(self):
+        retrying = False
+        while True:
+            with self._lock:
+                deadline = time.monotonic() + self.flush_interval
+                while not self._closed and (retrying or len(self._pending) < self.batch_size):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._wake.wait(remaining)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+                retrying = False
+            except Exception as e:  # the unsent emails are back in the queue for the next try
+                self.failed += 1
+                self.last_error = e
+                retrying = True
+
+    def flush(self) -> int:
+        """Sends everything pending over one connection; returns the number of emails sent"""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return 0
+        with self._send_lock:
+            done = 0
+            try:
+                with self._connect() as smtp:
+                    for msg in batch:
+                        smtp.send_message(msg)
+                        done += 1
+            except (smtplib.SMTPException, OSError):
+                with self._lock:
+                    self._pending[:0] = batch[done:]
+                raise
+            finally:
+                self.sent += done
+        return done
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._wake.notify()
+        self._sender.join()
+        self.flush()
+
+    def stats(self) -> Dict[str, float]:
+        return {"sent": self.sent, "failed": self.failed, "pending": len(self._pending)}
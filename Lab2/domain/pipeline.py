@@ -0,0 +1,73 @@
+from typing import Callable, List, Tuple
+from .decorator import OrderProcessor, OrderProcessorDecorator
+from .models import Order
+
+def _uses_hooks(layer: OrderProcessor) -> bool:
+    return (isinstance(layer, OrderProcessorDecorator)
+            and type(layer).process_order is OrderProcessorDecorator.process_order)
+
+class CompiledPipeline(OrderProcessor):
+    """A decorator chain flattened into tuples of bound before/after hooks run in one loop.
+
+    Layers are numbered from the outside in. Every before() hook is stored with the after()
+    hooks of the layers outside it, so when it stops the order exactly those unwind, as in
+    the nested chain, without checking layer numbers on the way out.
+    """
+    def __init__(self, befores: List[Tuple[int, Callable]], afters: List[Tuple[int, Callable]],
+                 core: OrderProcessor, depth: int):
+        # afters come innermost first
+        self._stages = tuple((before, tuple(after for j, after in afters if j < i)) for i, before in befores)
+        self._afters = tuple(after for _, after in afters)
+        self._core = core.process_order
+        self._depth = depth
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    def process_order(self, order: Order) -> bool:
+        for before, unwind in self._stages:
+            if not before(order):
+                result = False
+                for after in unwind:
+                    result = after(order, result)
+                return result
+        result = self._core(order)
+        for after in self._afters:
+            result = after(order, result)
+        return result
+
+def compile_pipeline(processor: OrderProcessor) -> OrderProcessor:
+    """Flattens the hook-based decorators at the top of a chain.
+
+    A decorator that overrides process_order itself cannot be flattened; it and everything
+    it wraps are kept as the pipeline's core and run the classic nested way. A chain with
+    fewer than two hook-based layers on top is returned unchanged.
+    """
+    befores, afters = [], []
+    depth = 0
+    layer = processor
+    while _uses_hooks(layer):
+        cls = type(layer)
+        if cls.before is not OrderProcessorDecorator.before:
+            befores.append((depth, layer.before))
+        if cls.after is not OrderProcessorDecorator.after:
+            afters.append((depth, layer.after))
+        depth += 1
+        layer = layer.wrapped
+    if depth < 2:
+        return processor  # a single layer is already as flat as it gets
+    afters.reverse()
+    return CompiledPipeline(befores, afters, layer, depth)
+
+class PipelineBuilder:
+    """Builds a decorator stack from the inside out and compiles it"""
+    def __init__(self, core: OrderProcessor):
+        self._processor = core
+
+    def add(self, decorator_cls, *args, **kwargs) -> "PipelineBuilder":
+        self._processor = decorator_cls(self._processor, *args, **kwargs)
+        return self
+
+    def build(self) -> OrderProcessor:
+        return compile_pipeline(self._processor)
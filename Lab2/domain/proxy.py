@@ -0,0 +1,86 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+from .models import LegacyPaymentSystem, to_cents
+
+class _InFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = False
+        self.error = None
+
+class IdempotentPaymentProxy:
+    """Caching proxy in front of a payment system, keyed by order id and amount.
+
+    A repeat of a successful payment inside `ttl` seconds returns True without another
+    gateway call, and duplicates that arrive while the first call is still running wait
+    for it and share its outcome instead of paying again. Declined payments and calls that
+    raise are not cached, so the next attempt reaches the gateway again.
+    At most `max_entries` successes are kept; the least recently used go first.
+    """
+    def __init__(self, payment_system: LegacyPaymentSystem, ttl: float = 300.0, max_entries: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.payment_system = payment_system
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._results: "OrderedDict[Tuple[str, int, str], Tuple[float, bool]]" = OrderedDict()
+        self._in_flight: Dict[Tuple[str, int, str], _InFlight] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def pay(self, order_id: str, amount: float, currency: str = "USD") -> bool:
+        key = (order_id, to_cents(amount), currency)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                expires, outcome = cached
+                if expires > self._clock():
+                    self._results.move_to_end(key)
+                    self.hits += 1
+                    return outcome
+                del self._results[key]
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                self.misses += 1
+                flight = self._in_flight[key] = _InFlight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            outcome = self.payment_system.process_payment_legacy(amount, currency)
+        except Exception as e:
+            flight.error = e
+            with self._lock:
+                del self._in_flight[key]
+            flight.done.set()
+            raise
+        with self._lock:
+            if outcome:  # only a payment that went through must not be repeated
+                self._results[key] = (self._clock() + self.ttl, outcome)
+                while len(self._results) > self.max_entries:
+                    self._results.popitem(last=False)
+            del self._in_flight[key]
+        flight.result = outcome
+        flight.done.set()
+        return outcome
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._in_flight),
+                "cached": len(self._results),
+            }
@@ -0,0 +1,150 @@
+import queue
+import sys
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from typing import Callable, List
+
+# Event sinks used by the logging and notification decorators
+BatchWriter = Callable[[List[str]], None]
+
+def stdout_writer(messages: List[str]):
+    sys.stdout.write("\n".join(messages) + "\n")
+    sys.stdout.flush()
+
+class EventSink(ABC):
+    @abstractmethod
+    def emit(self, message: str):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+class PrintSink(EventSink):
+    """Writes every event synchronously, on the caller's thread"""
+    def emit(self, message: str):
+        print(message)
+
+class WriterSink(EventSink):
+    """Hands every event to a batch writer synchronously, one event per call"""
+    def __init__(self, write_batch: BatchWriter = stdout_writer):
+        self._write_batch = write_batch
+
+    def emit(self, message: str):
+        self._write_batch([message])
+
+class _DrainStats:
+    def __init__(self):
+        self.written = 0
+        self.dropped = 0
+
+_STOP = object()
+
+def _drain(events: queue.Queue, write_batch: BatchWriter, batch_size: int, stats: _DrainStats):
+    # runs on the writer thread; it holds no reference to the sink, so an unused sink can be collected
+    while True:
+        batch = [events.get()]
+        while len(batch) < batch_size:
+            try:
+                batch.append(events.get_nowait())
+            except queue.Empty:
+                break
+        messages = [m for m in batch if m is not _STOP]
+        stop = len(messages) != len(batch)
+        try:
+            if messages:
+                write_batch(messages)
+                stats.written += len(messages)
+        except Exception:
+            # a failing writer must not kill the drain thread and block every producer
+            stats.dropped += len(messages)
+        finally:
+            for _ in batch:
+                events.task_done()
+        if stop:
+            return
+
+def _stop_drain(events: queue.Queue, thread: threading.Thread):
+    events.put(_STOP)
+    thread.join()
+
+class QueuedSink(EventSink):
+    """Bounded in-memory queue drained in batches by a background writer thread.
+
+    When the queue is full, overflow decides what emit() does: "block" waits for room,
+    "drop" discards the event, and "sample" keeps one in every `sample_every` overflowing
+    events (waiting for room for those) and discards the rest. close() - also run at
+    interpreter exit, or when the sink is garbage collected - waits for emit() calls in
+    progress and then writes out everything already queued.
+    """
+    OVERFLOW_POLICIES = ("block", "drop", "sample")
+
+    def __init__(self, write_batch: BatchWriter = stdout_writer, maxsize: int = 10000,
+                 batch_size: int = 256, overflow: str = "block", sample_every: int = 10):
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow!r}, expected one of {self.OVERFLOW_POLICIES}")
+        self._queue: queue.Queue = queue.Queue(maxsize)
+        self._overflow = overflow
+        self._sample_every = sample_every
+        self._overflowed = 0
+        self._closed = False
+        self._emitting = 0
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)  # no emit() in progress
+        self._stats = _DrainStats()
+        thread = threading.Thread(target=_drain, args=(self._queue, write_batch, batch_size, self._stats),
+                                  name="queued-sink", daemon=True)
+        thread.start()
+        self._finalizer = weakref.finalize(self, _stop_drain, self._queue, thread)
+
+    @property
+    def written(self) -> int:
+        return self._stats.written
+
+    @property
+    def dropped(self) -> int:
+        return self._stats.dropped
+
+    def emit(self, message: str):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Sink is closed")
+            self._emitting += 1
+        try:
+            self._put(message)
+        finally:
+            with self._lock:
+                self._emitting -= 1
+                if not self._emitting:
+                    self._idle.notify_all()
+
+    def _put(self, message: str):
+        if self._overflow == "block":
+            self._queue.put(message)
+            return
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            with self._lock:
+                self._overflowed += 1
+                keep = self._overflow == "sample" and self._overflowed % self._sample_every == 0
+                if not keep:
+                    self._stats.dropped += 1
+            if keep:
+                self._queue.put(message)
+
+    def flush(self):
+        """Blocks until every event emitted so far has been written"""
+        self._queue.join()
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            while self._emitting:  # an emit() that got past the check must land before the stop marker
+                self._idle.wait()
+        self._finalizer()
@@ -0,0 +1,52 @@
+import random
+import time
+import numpy as np
+from domain.models import Order, OrderItem, OrderStatus, Product
+from domain.patterns.strategy import (DiscountContext, FixedAmountDiscountStrategy, NoDiscountStrategy,
+                                      PercentageDiscountStrategy)
+
+ORDERS = 200000
+
+def make_orders(seed: int = 3):
+    rng = random.Random(seed)
+    products = [Product(f"P{i:03d}", f"Product {i}", round(rng.uniform(1, 500), 2), 10**9) for i in range(200)]
+    return [Order(f"ORD{i:06d}", [OrderItem(p, rng.randint(1, 4)) for p in rng.sample(products, rng.randint(1, 6))],
+                  OrderStatus.PENDING) for i in range(ORDERS)]
+
+def main():
+    orders = make_orders()
+    strategies = [NoDiscountStrategy(), PercentageDiscountStrategy(10), PercentageDiscountStrategy(15),
+                  FixedAmountDiscountStrategy(50), FixedAmountDiscountStrategy(120)]
+    print(f"{len(strategies)} strategies over {ORDERS} orders\n")
+
+    start = time.perf_counter()
+    for order in orders:
+        order.calculate_total()
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    for order in orders:
+        order.calculate_total()
+    cached = time.perf_counter() - start
+    print(f"calculate_total on every order: {first * 1000:.0f} ms first time, {cached * 1000:.0f} ms when unchanged")
+
+    context = DiscountContext()
+    start = time.perf_counter()
+    scalar = []
+    for strategy in strategies:
+        context.set_strategy(strategy)
+        scalar.append([context.calculate_final_amount(order) for order in orders])
+    loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = DiscountContext.compare(strategies, orders)
+    vectorized = time.perf_counter() - start
+    same = all(np.array_equal(r.final_amounts, np.asarray(s, dtype=np.float64)) for r, s in zip(results, scalar))
+    print(f"one strategy at a time: {loop * 1000:.0f} ms; DiscountContext.compare: {vectorized * 1000:.0f} ms "
+          f"(identical amounts: {same})\n")
+
+    print(f"{'strategy':<36} {'revenue':>16} {'discount':>14} {'mean order':>11} {'discounted':>11}")
+    for r in results:
+        print(f"{r.strategy!r:<36} {r.revenue:>16,.2f} {r.discount:>14,.2f} {r.mean_final:>11.2f} {r.orders_discounted:>11}")
+
+if __name__ == "__main__":
+    main()
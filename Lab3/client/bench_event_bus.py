@@ -0,0 +1,70 @@
+import contextlib
+import io
+import time
+from domain.event_bus import AsyncDispatcher
+from domain.models import Order, OrderItem, OrderStatus, Product
+from domain.patterns.command import CommandInvoker, ConfirmOrderCommand, ShipOrderCommand
+from domain.patterns.observer import OrderObserver, OrderSubject
+
+ORDERS = 500
+
+class SlowObserver(OrderObserver):
+    """Stands in for an observer doing network I/O per event, e.g. sending an email"""
+    def __init__(self, delay: float = 0.002):
+        self.delay = delay
+        self.seen = 0
+
+    def update(self, order: Order):
+        time.sleep(self.delay)
+        self.seen += 1
+
+class FlakyObserver(OrderObserver):
+    def update(self, order: Order):
+        raise RuntimeError(f"downstream rejected {order.order_id}")
+
+class CountingObserver(OrderObserver):
+    def __init__(self):
+        self.by_status = {}
+
+    def update(self, order: Order):
+        self.by_status[order.status] = self.by_status.get(order.status, 0) + 1
+
+def run(label: str, dispatcher: AsyncDispatcher = None):
+    subject = OrderSubject(dispatcher)
+    counter = CountingObserver()
+    for observer in (SlowObserver(), FlakyObserver(), counter):
+        subject.attach(observer)
+    invoker = CommandInvoker()
+    product = Product("P001", "Laptop", 999.99, ORDERS)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(ORDERS):
+            order = Order(f"ORD{i:05d}", [OrderItem(product, 1)], OrderStatus.PENDING)
+            try:
+                invoker.execute_command(ConfirmOrderCommand(order, subject))
+                invoker.execute_command(ShipOrderCommand(order, subject))
+            except RuntimeError:
+                pass  # synchronous mode: the flaky observer aborts the command
+    commands = time.perf_counter() - start
+    if dispatcher is not None:
+        dispatcher.flush()
+    total = time.perf_counter() - start
+
+    print(f"{label}: commands took {commands * 1000:.0f} ms, all observers done after {total * 1000:.0f} ms")
+    print(f"  counting observer saw {dict((s.value, n) for s, n in counter.by_status.items())}")
+    if dispatcher is not None:
+        for name, s in dispatcher.stats().items():
+            print(f"  {name:<16} delivered {s['delivered']:>4}  failed {s['failed']:>4}  dropped {s['dropped']:>4}  "
+                  f"lag {s['lag']}  max delay {s['max_delay'] * 1000:.1f} ms")
+        dispatcher.close()
+    print()
+
+def main():
+    print(f"{ORDERS} orders, confirm + ship each; one slow, one failing and one counting observer\n")
+    run("synchronous")
+    run("async, per-observer queues", AsyncDispatcher(maxsize=2 * ORDERS, batch_size=64))
+    run("async, small queues (drops)", AsyncDispatcher(maxsize=50, batch_size=16))
+
+if __name__ == "__main__":
+    main()
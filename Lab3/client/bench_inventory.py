@@ -0,0 +1,75 @@
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from domain.inventory import InsufficientStockError, ShardedInventory
+from domain.models import OrderItem, Product
+
+PRODUCTS = 50
+STOCK = 400
+ORDERS = 20000
+WORKERS = 8
+
+def make_orders(products, seed: int = 1):
+    rng = random.Random(seed)
+    return [(f"ORD{i:06d}", [OrderItem(p, rng.randint(1, 3)) for p in rng.sample(products, 3)])
+            for i in range(ORDERS)]
+
+def naive_reserve(items) -> bool:
+    # what the observer did before: check and decrement shared Product objects without locks
+    if any(item.product.stock < item.quantity for item in items):
+        return False
+    for item in items:
+        time.sleep(0)  # the old observer printed here, letting other threads run
+        item.product.stock -= item.quantity
+    return True
+
+def report(label: str, products, accepted, elapsed: float):
+    taken = sum(sum(item.quantity for item in items) for items in accepted)
+    left = sum(p.stock for p in products)
+    oversold = sum(-p.stock for p in products if p.stock < 0)
+    print(f"{label:<22} {len(accepted):>6} orders accepted in {elapsed * 1000:>5.0f} ms  "
+          f"stock accounted for: {taken + left == PRODUCTS * STOCK}  oversold units: {oversold}")
+
+def run_naive():
+    products = [Product(f"P{i:03d}", f"Product {i}", 9.99, STOCK) for i in range(PRODUCTS)]
+    orders = make_orders(products)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(WORKERS) as pool:
+        results = list(pool.map(lambda order: naive_reserve(order[1]), orders))
+    accepted = [items for (_, items), ok in zip(orders, results) if ok]
+    report("unlocked", products, accepted, time.perf_counter() - start)
+
+def run_sharded(shards: int):
+    products = [Product(f"P{i:03d}", f"Product {i}", 9.99, STOCK) for i in range(PRODUCTS)]
+    inventory = ShardedInventory(products, shards=shards, dedup_window=0.05)
+    orders = make_orders(products)
+
+    def confirm_and_ship(order) -> bool:
+        order_id, items = order
+        try:
+            inventory.reserve(order_id, items)
+        except InsufficientStockError:
+            return False
+        inventory.reserve(order_id, items)  # a redelivered event must not reserve twice
+        inventory.settle(order_id)
+        return True
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(WORKERS) as pool:
+        results = list(pool.map(confirm_and_ship, orders))
+    accepted = [items for (_, items), ok in zip(orders, results) if ok]
+    report(f"sharded ({shards} shards)", products, accepted, time.perf_counter() - start)
+    time.sleep(0.06)
+    inventory.release("expired")  # any call purges settled orders past the dedup window
+    print(f"{'':<22} orders still tracked after the dedup window: {inventory.tracked_orders()}")
+
+def main():
+    sys.setswitchinterval(1e-6)  # switch threads often so races show up in a short run
+    print(f"{ORDERS} orders of 3 items from {WORKERS} threads, {PRODUCTS} products x {STOCK} in stock\n")
+    run_naive()
+    run_sharded(1)
+    run_sharded(16)
+
+if __name__ == "__main__":
+    main()
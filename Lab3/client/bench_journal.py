@@ -0,0 +1,48 @@
+import os
+import tempfile
+import time
+from domain.journal import CommandJournal
+from domain.models import OrderStatus
+
+SIZES = (10000, 100000, 300000)
+ORDERS = 5000
+SNAPSHOT_EVERY = 7000
+STATUSES = (OrderStatus.CONFIRMED, OrderStatus.SHIPPED, OrderStatus.DELIVERED)
+
+def fill(directory: str, records: int, snapshot_every, group_size: int = 256) -> float:
+    journal = CommandJournal(directory, group_size=group_size, snapshot_every=snapshot_every)
+    start = time.perf_counter()
+    for i in range(records):
+        journal.append("execute", "confirm", f"ORD{i % ORDERS:05d}", STATUSES[i // ORDERS % 3])
+    journal.close()
+    return time.perf_counter() - start
+
+def recover(directory: str):
+    start = time.perf_counter()
+    journal = CommandJournal(directory, snapshot_every=None)
+    elapsed = time.perf_counter() - start
+    journal.close()
+    return elapsed, journal.replayed
+
+def main():
+    print(f"Journal over {ORDERS} orders, snapshot every {SNAPSHOT_EVERY} records; "
+          f"recovery = open the journal and rebuild every order's status\n")
+    with tempfile.TemporaryDirectory() as root:
+        for group_size in (1, 256):
+            directory = os.path.join(root, f"write-{group_size}")
+            elapsed = fill(directory, 5000, None, group_size)
+            print(f"writing 5000 records, fsync every {group_size:>3}: {5000 / elapsed:>9.0f} records/s")
+        print()
+        print(f"{'records':>8}  {'full replay':>22}  {'snapshot + tail':>24}")
+        for records in SIZES:
+            full_dir = os.path.join(root, f"full-{records}")
+            snap_dir = os.path.join(root, f"snap-{records}")
+            fill(full_dir, records, None)
+            fill(snap_dir, records, SNAPSHOT_EVERY)
+            full, full_replayed = recover(full_dir)
+            snap, snap_replayed = recover(snap_dir)
+            print(f"{records:>8}  {full * 1000:>7.1f} ms ({full_replayed:>6} replayed)  "
+                  f"{snap * 1000:>7.1f} ms ({snap_replayed:>6} replayed)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import contextlib
+import io
+import time
+from domain.inventory import ShardedInventory
+from domain.models import Order, OrderItem, OrderStatus, Product
+from domain.patterns.command import CommandInvoker, ConfirmOrderCommand, MacroCommand
+from domain.patterns.observer import AnalyticsService, EmailNotificationService, InventoryManagementService, OrderSubject
+
+ORDERS = 10000
+
+class CallCounter:
+    """Counts calls the subject makes into observers (update or update_batch, whichever comes first)"""
+    def __init__(self, observers):
+        self.calls = 0
+        self._depth = 0
+        for observer in observers:
+            for name in ("update", "update_batch"):
+                setattr(observer, name, self._counted(getattr(observer, name)))
+
+    def _counted(self, method):
+        def wrapper(*args):
+            if not self._depth:
+                self.calls += 1
+            self._depth += 1
+            try:
+                return method(*args)
+            finally:
+                self._depth -= 1
+        return wrapper
+
+def setup():
+    product = Product("P001", "Laptop", 999.99, ORDERS)
+    subject = OrderSubject()
+    observers = [EmailNotificationService(), InventoryManagementService(ShardedInventory([product])), AnalyticsService()]
+    for observer in observers:
+        subject.attach(observer)
+    orders = [Order(f"ORD{i:05d}", [OrderItem(product, 1)], OrderStatus.PENDING) for i in range(ORDERS)]
+    return subject, CallCounter(observers), orders, product
+
+def run(label: str, batched: bool):
+    subject, counter, orders, product = setup()
+    invoker = CommandInvoker()
+    commands = [ConfirmOrderCommand(order, subject) for order in orders]
+    out = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        if batched:
+            invoker.execute_command(MacroCommand(commands, subject))
+        else:
+            for command in commands:
+                invoker.execute_command(command)
+    elapsed = time.perf_counter() - start
+    calls_after_execute = counter.calls
+    with contextlib.redirect_stdout(io.StringIO()):
+        if batched:
+            invoker.undo_last()
+        else:
+            for _ in commands:
+                invoker.undo_last()
+    pending = sum(order.status == OrderStatus.PENDING for order in orders)
+    print(f"{label:<28} {elapsed * 1000:>6.0f} ms, {calls_after_execute:>6} observer calls; "
+          f"after undo: {pending} orders pending, stock {product.stock}/{ORDERS}")
+
+def main():
+    print(f"Confirming {ORDERS} orders with email, inventory and analytics observers attached\n")
+    run("one command per order", batched=False)
+    run("one MacroCommand", batched=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import contextlib
+import io
+import time
+from client.smtp_standin import LocalSMTPServer
+from domain.models import Order, OrderItem, OrderStatus, Product
+from domain.outbox import EmailOutbox
+from domain.patterns.command import CommandInvoker, ConfirmOrderCommand, ShipOrderCommand
+from domain.patterns.observer import EmailNotificationService, OrderSubject
+
+ORDERS = 500
+CONNECT_DELAY = 0.002  # simulated SMTP connection setup
+
+def run(label: str, batch_size: int, server: LocalSMTPServer, flush_each: bool = False):
+    outbox = EmailOutbox(port=server.port, batch_size=batch_size)
+    subject = OrderSubject()
+    subject.attach(EmailNotificationService(outbox))
+    invoker = CommandInvoker()
+    product = Product("P001", "Laptop", 999.99, ORDERS)
+    before = server.messages, server.connections
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(ORDERS):
+            order = Order(f"ORD{i:05d}", [OrderItem(product, 1)], OrderStatus.PENDING)
+            for step in (lambda: invoker.execute_command(ConfirmOrderCommand(order, subject)),
+                         lambda: invoker.execute_command(ShipOrderCommand(order, subject)),
+                         invoker.undo_last):
+                step()
+                if flush_each:
+                    outbox.flush()  # what sending inline did: one connection per change
+        outbox.close()
+    elapsed = time.perf_counter() - start
+
+    stats = outbox.stats()
+    received = server.messages - before[0]
+    connections = server.connections - before[1]
+    print(f"{label:<22} {stats['queued']:>6} notifications -> {received:>5} emails "
+          f"({stats['merged']} merged) over {connections:>4} connections  "
+          f"{stats['messages_per_sec']:>8.0f} msg/s  {elapsed:.2f}s total")
+
+def main():
+    print(f"{ORDERS} orders, confirm + ship + undo each, {CONNECT_DELAY * 1000:.0f} ms connection setup\n")
+    with LocalSMTPServer(connect_delay=CONNECT_DELAY) as server:
+        run("one email per change", 1, server, flush_each=True)
+        run("batched outbox (100)", 100, server)
+
+if __name__ == "__main__":
+    main()
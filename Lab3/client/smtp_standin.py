@@ -0,0 +1,65 @@
+import socket
+import socketserver
+import threading
+import time
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: greeting, EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT"""
+    def _reply(self, line: str):
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def handle(self):
+        server: LocalSMTPServer = self.server
+        with server.lock:
+            server.connections += 1
+        time.sleep(server.connect_delay)  # connection setup, the cost batching amortizes
+        self._reply("220 localhost stand-in ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            verb = line.decode("ascii", "replace").strip().split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self._reply("250-localhost\r\n250 8BITMIME")
+            elif verb in ("HELO", "MAIL", "RCPT", "RSET", "NOOP"):
+                self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                with server.lock:
+                    server.messages += 1
+                self._reply("250 OK queued")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    """Local SMTP stand-in that accepts and counts messages without delivering them"""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port: int = 0, connect_delay: float = 0.0):
+        super().__init__(("127.0.0.1", port), _SMTPHandler)
+        self.connect_delay = connect_delay
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = 0
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, name="smtp-standin", daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,156 @@
+import atexit
+import queue
+import threading
+import time
+from typing import Dict, List, Tuple
+
+# Asynchronous delivery of order events, one bounded queue and worker thread per observer
+class ObserverChannel:
+    """Queue and worker for one observer.
+
+    Events are delivered in batches through observer.update_batch(). When the queue is full,
+    overflow decides what publish does: "drop" discards the event, "block" waits for room.
+    An observer that raises loses that batch (counted in `failed`) and keeps receiving events.
+    """
+    _STOP = object()
+
+    def __init__(self, observer, maxsize: int = 1000, batch_size: int = 64, overflow: str = "drop"):
+        self.observer = observer
+        self._queue: queue.Queue = queue.Queue(maxsize)
+        self._batch_size = batch_size
+        self._overflow = overflow
+        self._lock = threading.Lock()
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.failed = 0
+        self.last_error: Exception = None
+        self.last_delay = 0.0
+        self.max_delay = 0.0
+        self._thread = threading.Thread(target=self._run, name=f"observer-{type(observer).__name__}", daemon=True)
+        self._thread.start()
+
+    def publish(self, order):
+        event = (time.perf_counter(), order)
+        if self._overflow == "block":
+            self._queue.put(event)
+        else:
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                with self._lock:
+                    self.dropped += 1
+                return
+        with self._lock:
+            self.published += 1
+
+    def _run(self):
+        while True:
+            batch: List[Tuple[float, object]] = [self._queue.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            events = [e for e in batch if e is not self._STOP]
+            try:
+                if events:
+                    delay = time.perf_counter() - events[0][0]
+                    self.last_delay = delay
+                    self.max_delay = max(self.max_delay, delay)
+                    self.observer.update_batch([order for _, order in events])
+                    self.delivered += len(events)
+            except Exception as e:
+                # isolate the failure to this observer; its thread keeps draining
+                self.failed += len(events)
+                self.last_error = e
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if len(events) != len(batch):
+                return
+
+    @property
+    def lag(self) -> int:
+        """Events published but not yet handed to the observer"""
+        return self._queue.qsize()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "lag": self.lag,
+            "last_delay": self.last_delay,
+            "max_delay": self.max_delay,
+        }
+
+    def flush(self):
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(self._STOP)
+        self._thread.join()
+
+class AsyncDispatcher:
+    """Gives every attached observer its own ObserverChannel, so a slow or failing observer
+    only backs up its own queue. close() - also run at interpreter exit - delivers everything
+    already queued."""
+    OVERFLOW_POLICIES = ("drop", "block")
+
+    def __init__(self, maxsize: int = 1000, batch_size: int = 64, overflow: str = "drop"):
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow!r}, expected one of {self.OVERFLOW_POLICIES}")
+        self._maxsize = maxsize
+        self._batch_size = batch_size
+        self._overflow = overflow
+        self._channels: Dict[int, ObserverChannel] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        atexit.register(self.close)
+
+    def add(self, observer):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Dispatcher is closed")
+            if id(observer) not in self._channels:
+                self._channels[id(observer)] = ObserverChannel(observer, self._maxsize, self._batch_size, self._overflow)
+
+    def remove(self, observer):
+        """Stops delivering to the observer once the events already queued for it are delivered"""
+        with self._lock:
+            channel = self._channels.pop(id(observer), None)
+        if channel is not None:
+            channel.close()
+
+    def dispatch(self, observer, order):
+        channel = self._channels.get(id(observer))
+        if channel is not None:
+            channel.publish(order)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-observer counters, keyed by observer class name"""
+        result = {}
+        for channel in list(self._channels.values()):
+            name = type(channel.observer).__name__
+            if name in result:
+                name = f"{name}#{id(channel.observer):x}"
+            result[name] = channel.stats()
+        return result
+
+    def flush(self):
+        """Blocks until every event published so far has been delivered"""
+        for channel in list(self._channels.values()):
+            channel.flush()
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            channels = list(self._channels.values())
+            self._channels.clear()
+        for channel in channels:
+            channel.close()
+        atexit.unregister(self.close)
@@ -0,0 +1,147 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import ExitStack
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+from domain.models import OrderItem, Product
+
+class InsufficientStockError(ValueError):
+    def __init__(self, product: Product, requested: int):
+        super().__init__(f"{product.name} has {product.stock} in stock, {requested} requested")
+        self.product = product
+        self.requested = requested
+
+class ShardedInventory:
+    """Stock of every known product, split into shards by product id, each behind its own lock.
+
+    reserve() takes all items of an order or none: it locks the shards involved in a fixed order,
+    checks every line, then decrements. Stock is kept on the Product objects themselves.
+
+    Reservations stay open until release() (undo or cancel) or settle() (shipped). Settling is
+    final: the stock has left, so release() no longer returns it. Settled orders are remembered
+    for `dedup_window` seconds so that a repeated reserve() for them is ignored; after that they
+    are forgotten, so memory stays bounded by the orders in flight plus those settled within
+    the window.
+    """
+    def __init__(self, products: Iterable[Product] = (), shards: int = 16, dedup_window: float = 3600.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self._shards: List[Dict[str, Product]] = [{} for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._dedup_window = dedup_window
+        self._clock = clock
+        self._orders_lock = threading.Lock()
+        self._open: Dict[str, Optional[Dict[str, int]]] = {}  # None while reserve() is still running
+        self._settled: "OrderedDict[str, Tuple[float, Dict[str, int]]]" = OrderedDict()
+        for product in products:
+            self.add_product(product)
+
+    def _shard(self, product_id: str) -> int:
+        return hash(product_id) % len(self._shards)
+
+    def add_product(self, product: Product):
+        index = self._shard(product.id)
+        with self._locks[index]:
+            self._shards[index][product.id] = product
+
+    def stock(self, product_id: str) -> int:
+        index = self._shard(product_id)
+        with self._locks[index]:
+            return self._shards[index][product_id].stock
+
+    def _expire(self, now: float):
+        # settled orders are kept in settle order, so the expired ones are at the front
+        while self._settled:
+            order_id, (settled_at, _) = next(iter(self._settled.items()))
+            if now - settled_at < self._dedup_window:
+                break
+            del self._settled[order_id]
+
+    def _locked(self, product_ids: Iterable[str]) -> ExitStack:
+        stack = ExitStack()
+        for index in sorted({self._shard(pid) for pid in product_ids}):
+            stack.enter_context(self._locks[index])
+        return stack
+
+    def reserve(self, order_id: str, items: Iterable[OrderItem]) -> bool:
+        """Takes stock for every item, or raises InsufficientStockError and takes nothing.
+
+        Returns False without touching stock when the order is already reserved or was settled
+        within the dedup window.
+        """
+        (result,) = self.reserve_many([(order_id, items)])
+        if isinstance(result, InsufficientStockError):
+            raise result
+        return result
+
+    def reserve_many(self, orders: Iterable[Tuple[str, Iterable[OrderItem]]]) -> List[Union[bool, InsufficientStockError]]:
+        """reserve() for each (order_id, items) pair, in order, taking the shard locks once for the
+        whole batch. Each order is still all-or-nothing on its own; the result for each is True,
+        False (duplicate) or the InsufficientStockError that rejected it."""
+        orders = list(orders)
+        results: List[Union[bool, InsufficientStockError]] = [False] * len(orders)
+        claimed = []
+        with self._orders_lock:
+            self._expire(self._clock())
+            for i, (order_id, _) in enumerate(orders):
+                if order_id not in self._open and order_id not in self._settled:
+                    self._open[order_id] = None  # claim the id while the shards are locked
+                    claimed.append(i)
+
+        wanted: Dict[int, Dict[str, int]] = {}
+        products: Dict[str, Product] = {}
+        for i in claimed:
+            quantities = wanted[i] = {}
+            for item in orders[i][1]:
+                quantities[item.product.id] = quantities.get(item.product.id, 0) + item.quantity
+                products.setdefault(item.product.id, item.product)
+        try:
+            with self._locked(products):
+                for pid, product in products.items():
+                    products[pid] = self._shards[self._shard(pid)].setdefault(pid, product)
+                for i in claimed:
+                    short = next((pid for pid, qty in wanted[i].items() if products[pid].stock < qty), None)
+                    if short is not None:
+                        results[i] = InsufficientStockError(products[short], wanted[i][short])
+                        continue
+                    for pid, quantity in wanted[i].items():
+                        products[pid].stock -= quantity
+                    results[i] = True
+        finally:
+            with self._orders_lock:
+                for i in claimed:
+                    if results[i] is True:
+                        self._open[orders[i][0]] = wanted[i]
+                    else:
+                        del self._open[orders[i][0]]
+        return results
+
+    def is_reserved(self, order_id: str) -> bool:
+        """True while the order holds an open (not yet settled) reservation"""
+        with self._orders_lock:
+            return self._open.get(order_id) is not None
+
+    def release(self, order_id: str) -> bool:
+        """Returns the stock of an open reservation; settled and unknown orders are left alone"""
+        with self._orders_lock:
+            self._expire(self._clock())
+            if self._open.get(order_id) is None:
+                return False
+            wanted = self._open.pop(order_id)
+        with self._locked(wanted):
+            for pid, quantity in wanted.items():
+                self._shards[self._shard(pid)][pid].stock += quantity
+        return True
+
+    def settle(self, order_id: str) -> bool:
+        """Marks a reservation as final (the goods have left)"""
+        with self._orders_lock:
+            now = self._clock()
+            self._expire(now)
+            if self._open.get(order_id) is None:
+                return False
+            self._settled[order_id] = (now, self._open.pop(order_id))
+            return True
+
+    def tracked_orders(self) -> int:
+        with self._orders_lock:
+            return len(self._open) + len(self._settled)
@@ -0,0 +1,146 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterator, Optional
+from domain.models import OrderStatus
+
+class CommandJournal:
+    """Append-only log of executed and undone order commands, with snapshots for fast recovery.
+
+    Every record is one JSON line carrying a sequence number and the order's resulting status.
+    Writes are fsynced in groups: by append() once `group_size` records are waiting, by a
+    background flusher `group_interval` seconds after the oldest unsynced record was written,
+    or on sync()/close(). A crash can lose at most the records of the group still waiting, and
+    none older than `group_interval`. Call close() to stop the flusher.
+
+    Every `snapshot_every` records the current status of every order is written to a snapshot
+    (atomically, via rename) and the log is truncated. Opening a journal loads the snapshot and
+    replays only the records logged after it; a torn last line from a crash is dropped.
+    """
+    LOG_NAME = "commands.log"
+    SNAPSHOT_NAME = "snapshot.json"
+
+    def __init__(self, directory: str, group_size: int = 64, group_interval: float = 0.05,
+                 snapshot_every: Optional[int] = 10000):
+        os.makedirs(directory, exist_ok=True)
+        self.log_path = os.path.join(directory, self.LOG_NAME)
+        self.snapshot_path = os.path.join(directory, self.SNAPSHOT_NAME)
+        self.group_size = group_size
+        self.group_interval = group_interval
+        self.snapshot_every = snapshot_every
+        self._lock = threading.Lock()
+        self._pending = threading.Condition(self._lock)  # wakes the flusher
+        self._orders: Dict[str, str] = {}
+        self._seq = 0
+        self._snapshot_seq = 0
+        self.replayed = 0
+        self._recover()
+        self._log = open(self.log_path, "a", encoding="utf-8")
+        self._unsynced = 0
+        self._oldest_unsynced = 0.0
+        self.fsyncs = 0
+        self._flusher = threading.Thread(target=self._flush_loop, name="journal-flusher", daemon=True)
+        self._flusher.start()
+
+    def _recover(self):
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            self._orders = snapshot["orders"]
+            self._seq = self._snapshot_seq = snapshot["seq"]
+        if not os.path.exists(self.log_path):
+            return
+        good_bytes = 0
+        for record, end in self._read_log():
+            if record["seq"] > self._snapshot_seq:  # older records predate the snapshot
+                self._orders[record["order_id"]] = record["status"]
+                self._seq = record["seq"]
+                self.replayed += 1
+            good_bytes = end
+        if good_bytes != os.path.getsize(self.log_path):
+            with open(self.log_path, "r+b") as f:
+                f.truncate(good_bytes)
+
+    def _read_log(self) -> Iterator[tuple]:
+        with open(self.log_path, "rb") as f:
+            end = 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    return  # torn write
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    return
+                end += len(line)
+                yield record, end
+
+    def append(self, op: str, command: str, order_id: str, status: OrderStatus):
+        with self._lock:
+            self._seq += 1
+            self._log.write(json.dumps({"seq": self._seq, "op": op, "command": command,
+                                        "order_id": order_id, "status": status.value}) + "\n")
+            self._orders[order_id] = status.value
+            if not self._unsynced:
+                self._oldest_unsynced = time.monotonic()
+                self._pending.notify()
+            self._unsynced += 1
+            if self._unsynced >= self.group_size:
+                self._sync_locked()
+            if self.snapshot_every and self._seq - self._snapshot_seq >= self.snapshot_every:
+                self._snapshot_locked()
+
+    def _sync_locked(self):
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self.fsyncs += 1
+        self._unsynced = 0
+
+    def _flush_loop(self):
+        with self._lock:
+            while not self._log.closed:
+                if not self._unsynced:
+                    self._pending.wait()
+                    continue
+                due = self._oldest_unsynced + self.group_interval - time.monotonic()
+                if due > 0:
+                    self._pending.wait(due)
+                else:
+                    self._sync_locked()
+
+    def sync(self):
+        with self._lock:
+            if self._unsynced:
+                self._sync_locked()
+
+    def _snapshot_locked(self):
+        self._sync_locked()
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"seq": self._seq, "orders": self._orders}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        # everything in the log is now covered by the snapshot
+        self._log.truncate(0)
+        self._log.seek(0)
+        self._snapshot_seq = self._seq
+
+    def snapshot(self):
+        with self._lock:
+            self._snapshot_locked()
+
+    def states(self) -> Dict[str, OrderStatus]:
+        """Last journaled status of every order"""
+        with self._lock:
+            return {order_id: OrderStatus(value) for order_id, value in self._orders.items()}
+
+    def close(self):
+        with self._lock:
+            if self._log.closed:
+                return
+            if self._unsynced:
+                self._sync_locked()
+            self._log.close()
+            self._pending.notify()
+        self._flusher.join()
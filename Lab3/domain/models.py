@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List
+from typing import ClassVar, Iterable, List, Optional
 from enum import Enum
 
 class OrderStatus(Enum):
@@ -16,18 +16,119 @@ class Product:
     price: float
     stock: int
 
+    # bumped on every price change, so cached order totals know to recompute
+    price_epoch: ClassVar[int] = 0
+
+    def __setattr__(self, name, value):
+        if name == "price" and "price" in self.__dict__:
+            Product.price_epoch += 1
+        object.__setattr__(self, name, value)
+
 @dataclass
 class OrderItem:
     product: Product
     quantity: int
 
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        owner = self.__dict__.get("_owner")
+        if owner is not None:
+            owner._invalidate_total()
+
+class OrderItemList(list):
+    """Items of an order; items are tagged with the order as they are added, and every change
+    to the list or to a tagged item marks the order's cached total as stale"""
+    def __init__(self, iterable: Iterable[OrderItem] = (), owner: Optional["Order"] = None):
+        super().__init__(iterable)
+        self._owner = owner
+        self._adopt(self)
+
+    def _adopt(self, items: Iterable[OrderItem]):
+        for item in items:
+            object.__setattr__(item, "_owner", self._owner)
+
+    def _changed(self):
+        if self._owner is not None:
+            self._owner._invalidate_total()
+
+    def append(self, item: OrderItem):
+        super().append(item)
+        self._adopt((item,))
+        self._changed()
+
+    def insert(self, index: int, item: OrderItem):
+        super().insert(index, item)
+        self._adopt((item,))
+        self._changed()
+
+    def extend(self, items: Iterable[OrderItem]):
+        items = list(items)
+        super().extend(items)
+        self._adopt(items)
+        self._changed()
+
+    def __iadd__(self, items: Iterable[OrderItem]):
+        self.extend(items)
+        return self
+
+    def __setitem__(self, index, value):
+        value = list(value) if isinstance(index, slice) else value
+        super().__setitem__(index, value)
+        self._adopt(value if isinstance(index, slice) else (value,))
+        self._changed()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._changed()
+
+    def __imul__(self, times: int):
+        result = super().__imul__(times)
+        self._changed()
+        return result
+
+    def remove(self, item: OrderItem):
+        super().remove(item)
+        self._changed()
+
+    def pop(self, index: int = -1) -> OrderItem:
+        item = super().pop(index)
+        self._changed()
+        return item
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
 @dataclass
 class Order:
+    """Caches its total and only re-sums the items after they (or any product price) change.
+
+    An item belongs to one order at a time; changing its product or quantity marks that order stale.
+    """
     order_id: str
     items: List[OrderItem]
     status: OrderStatus
     total_amount: float = 0.0
+
+    def __setattr__(self, name, value):
+        if name == "items":
+            if not (isinstance(value, OrderItemList) and value._owner is self):
+                value = OrderItemList(value, self)
+            self._invalidate_total()
+        object.__setattr__(self, name, value)
+
+    def _invalidate_total(self):
+        object.__setattr__(self, "_cached_total", None)
+
+    @property
+    def total(self) -> float:
+        cached = self.__dict__.get("_cached_total")
+        if cached is None or self.__dict__["_cached_epoch"] != Product.price_epoch:
+            cached = sum(item.product.price * item.quantity for item in self.items)
+            object.__setattr__(self, "_cached_total", cached)
+            object.__setattr__(self, "_cached_epoch", Product.price_epoch)
+        return cached
     
     def calculate_total(self):
-        self.total_amount = sum(item.product.price * item.quantity for item in self.items)
+        self.total_amount = self.total
         return self.total_amount
\ No newline at end of file
@@ -0,0 +1,142 @@
+import smtplib
+import threading
+import time
+from collections import OrderedDict
+from email.message import EmailMessage
+from typing import Callable, Dict, List, Optional
+
+class PendingEmail:
+    def __init__(self, order_id: str, recipient: str):
+        self.order_id = order_id
+        self.recipient = recipient
+        self.statuses: List[str] = []
+        self.lines: List[str] = []
+
+    def to_message(self, sender: str) -> EmailMessage:
+        msg = EmailMessage()
+        msg["From"] = sender
+        msg["To"] = self.recipient
+        msg["Subject"] = f"Order {self.order_id}: {self.statuses[-1]}"
+        history = " -> ".join(self.statuses)
+        msg.set_content(f"Status: {history}\n\n" + "\n".join(self.lines) + "\n")
+        return msg
+
+class EmailOutbox:
+    """Queues order notifications and sends them in batches over one SMTP connection.
+
+    Notifications for an order that is still waiting in the outbox are merged into its
+    pending message, so confirm/ship/undo in quick succession becomes a single email.
+
+    enqueue() never touches the network, so it is safe to call from observers. A background
+    sender sends a batch once `batch_size` messages are pending, or whatever is pending every
+    `flush_interval` seconds. A failed batch is put back and retried after `flush_interval`;
+    the sender only counts the failure (`failed`, `last_error`). flush() sends on the calling
+    thread and does raise; close() stops the sender and flushes what is left.
+    """
+    def __init__(self, host: str = "localhost", port: int = 25, sender: str = "orders@example.com",
+                 batch_size: int = 100, flush_interval: float = 1.0, recipient_for: Callable[[str], str] = None,
+                 connect: Callable[[], smtplib.SMTP] = None):
+        self.sender = sender
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._recipient_for = recipient_for or (lambda order_id: f"customer+{order_id}@example.com")
+        self._connect = connect or (lambda: smtplib.SMTP(host, port, local_hostname="localhost", timeout=10))
+        self._pending: "OrderedDict[str, PendingEmail]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._send_lock = threading.Lock()
+        self._closed = False
+        self.queued = 0
+        self.merged = 0
+        self.sent = 0
+        self.batches = 0
+        self.failed = 0
+        self.last_error: Optional[Exception] = None
+        self.send_seconds = 0.0
+        self._sender = threading.Thread(target=self._send_loop, name="email-outbox", daemon=True)
+        self._sender.start()
+
+    def enqueue(self, order_id: str, status: str, lines: List[str]):
+        with self._lock:
+            pending = self._pending.get(order_id)
+            if pending is None:
+                pending = self._pending[order_id] = PendingEmail(order_id, self._recipient_for(order_id))
+            else:
+                self.merged += 1
+            pending.statuses.append(status)
+            pending.lines.extend(lines)
+            self.queued += 1
+            if len(self._pending) >= self.batch_size:
+                self._wake.notify()
+
+    def _send_loop(self):
+        retrying = False
+        while True:
+            with self._lock:
+                deadline = time.monotonic() + self.flush_interval
+                while not self._closed and (retrying or len(self._pending) < self.batch_size):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._wake.wait(remaining)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+                retrying = False
+            except Exception as e:  # keep sending later; the unsent emails are back in the queue
+                self.failed += 1
+                self.last_error = e
+                retrying = True
+
+    def flush(self) -> int:
+        """Sends everything pending over one connection; returns the number of emails sent"""
+        with self._lock:
+            batch = list(self._pending.values())
+            self._pending.clear()
+        if not batch:
+            return 0
+        with self._send_lock:
+            start = time.perf_counter()
+            done = 0
+            try:
+                with self._connect() as smtp:
+                    for pending in batch:
+                        smtp.send_message(pending.to_message(self.sender))
+                        done += 1
+            except (smtplib.SMTPException, OSError):
+                self._requeue(batch[done:])
+                raise
+            finally:
+                self.send_seconds += time.perf_counter() - start
+                self.sent += done
+            self.batches += 1
+        return done
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._wake.notify()
+        self._sender.join()
+        self.flush()
+
+    def _requeue(self, unsent: List[PendingEmail]):
+        # put unsent emails back at the front, folding in anything queued for them meanwhile
+        with self._lock:
+            for pending in reversed(unsent):
+                newer = self._pending.pop(pending.order_id, None)
+                if newer is not None:
+                    pending.statuses.extend(newer.statuses)
+                    pending.lines.extend(newer.lines)
+                self._pending[pending.order_id] = pending
+                self._pending.move_to_end(pending.order_id, last=False)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "queued": self.queued,
+            "merged": self.merged,
+            "sent": self.sent,
+            "batches": self.batches,
+            "failed": self.failed,
+            "messages_per_sec": self.sent / self.send_seconds if self.send_seconds else 0.0,
+        }
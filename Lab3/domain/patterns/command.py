@@ -1,7 +1,13 @@
 from abc import ABC, abstractmethod
+from collections import deque
+from typing import Iterator, List, Tuple
+from domain.inventory import ShardedInventory
+from domain.journal import CommandJournal
 from domain.models import Order, OrderStatus
 
 class OrderCommand(ABC):
+    name = "command"  # how the journal records it
+
     @abstractmethod
     def execute(self):
         pass
@@ -11,24 +17,46 @@ class OrderCommand(ABC):
         pass
 
 class ConfirmOrderCommand(OrderCommand):
-    def __init__(self, order: Order, subject):
+    """Confirms an order. With an inventory, the order's stock is reserved before its status
+    changes, so an InsufficientStockError leaves the order as it was; undo gives the stock back.
+    If an observer raises while the confirmation is announced, the order also keeps its status."""
+    name = "confirm"
+
+    def __init__(self, order: Order, subject, inventory: ShardedInventory = None):
         self.order = order
         self.subject = subject
+        self.inventory = inventory
         self.previous_status = None
+        self.reserved = False  # whether this command took the stock, and so must give it back
     
     def execute(self):
-        self.previous_status = self.order.status
+        reserved = self.inventory is not None and self.inventory.reserve(self.order.order_id, self.order.items)
+        previous_status = self.order.status
         self.order.status = OrderStatus.CONFIRMED
         self.order.calculate_total()
-        self.subject.notify_observers(self.order)
+        try:
+            self.subject.notify_observers(self.order, previous_status)
+        except Exception:
+            self.order.status = previous_status
+            if reserved:
+                self.inventory.release(self.order.order_id)
+            raise
+        self.previous_status = previous_status
+        self.reserved = reserved
         print(f"Order {self.order.order_id} confirmed")
     
     def undo(self):
+        reverted = self.order.status
         self.order.status = self.previous_status
-        self.subject.notify_observers(self.order)  # Added notification
+        self.subject.notify_observers(self.order, reverted)  # Added notification
+        if self.reserved:
+            self.inventory.release(self.order.order_id)
+            self.reserved = False
         print(f"Order {self.order.order_id} reverted to {self.previous_status.value}")
 
 class ShipOrderCommand(OrderCommand):
+    name = "ship"
+
     def __init__(self, order: Order, subject):
         self.order = order
         self.subject = subject
@@ -40,15 +68,18 @@ class ShipOrderCommand(OrderCommand):
         
         self.previous_status = self.order.status
         self.order.status = OrderStatus.SHIPPED
-        self.subject.notify_observers(self.order)
+        self.subject.notify_observers(self.order, self.previous_status)
         print(f"Order {self.order.order_id} shipped")
     
     def undo(self):
+        reverted = self.order.status
         self.order.status = self.previous_status
-        self.subject.notify_observers(self.order)  # Added notification
+        self.subject.notify_observers(self.order, reverted)  # Added notification
         print(f"Order {self.order.order_id} reverted to {self.previous_status.value}")
 
 class CancelOrderCommand(OrderCommand):
+    name = "cancel"
+
     def __init__(self, order: Order, subject):
         self.order = order
         self.subject = subject
@@ -57,23 +88,101 @@ class CancelOrderCommand(OrderCommand):
     def execute(self):
         self.previous_status = self.order.status
         self.order.status = OrderStatus.CANCELLED
-        self.subject.notify_observers(self.order)
+        self.subject.notify_observers(self.order, self.previous_status)
         print(f"Order {self.order.order_id} cancelled")
     
     def undo(self):
+        reverted = self.order.status
         self.order.status = self.previous_status
-        self.subject.notify_observers(self.order)  # Added notification
+        self.subject.notify_observers(self.order, reverted)  # Added notification
         print(f"Order {self.order.order_id} reverted to {self.previous_status.value}")
 
+class MacroCommand(OrderCommand):
+    """Runs many commands as one unit.
+
+    Observers get a single batched notification for the whole unit (see OrderSubject.batch).
+    If a command fails, the ones already run are undone and nothing is notified. If an observer
+    rejects the batch (e.g. out of stock), every command is undone and observers are told so.
+    Undo reverts every command, latest first, or none of them.
+    """
+    name = "macro"
+
+    def __init__(self, commands: List[OrderCommand], subject):
+        self.commands = list(commands)
+        self.subject = subject
+        # (leaf command, status it left its order in), in the order the leaves ran
+        self.executed: List[Tuple[OrderCommand, OrderStatus]] = []
+        self.undone: List[Tuple[OrderCommand, OrderStatus]] = []
+
+    def execute(self):
+        done = []
+        executed = []
+        try:
+            with self.subject.batch():
+                try:
+                    for command in self.commands:
+                        command.execute()
+                        done.append(command)
+                        executed.extend(_leaf_results(command))
+                except Exception:
+                    # nobody has seen these changes yet: undo them inside the discarded batch
+                    for command in reversed(done):
+                        command.undo()
+                    done = []
+                    raise
+        except Exception:
+            # an observer failed while the batch was delivered, and some may have applied it,
+            # so the undo is delivered as a batch too
+            with self.subject.batch():
+                for command in reversed(done):
+                    command.undo()
+            raise
+        self.executed = executed
+
+    def undo(self):
+        with self.subject.batch():
+            undone = []
+            results = []
+            try:
+                for command in reversed(self.commands):
+                    command.undo()
+                    undone.append(command)
+                    results.extend(_leaf_results(command, undo=True))
+            except Exception:
+                for command in reversed(undone):
+                    command.execute()
+                raise
+            self.undone = results
+
+def _leaf_results(command: OrderCommand, undo: bool = False) -> Iterator[Tuple[OrderCommand, OrderStatus]]:
+    """The leaf commands of the last execute (or undo) of `command`, with the status each left its
+    order in at the time; a macro touching one order twice must not journal its final status twice"""
+    if isinstance(command, MacroCommand):
+        yield from command.undone if undo else command.executed
+    else:
+        yield command, command.order.status
+
 class CommandInvoker:
-    def __init__(self):
-        self._history = []
+    """Runs commands and keeps the most recent ones for undo.
+
+    With a journal, every execute and undo is also appended to it, so order states survive
+    a restart; `history_limit` caps how many commands stay undoable in memory.
+    """
+    def __init__(self, journal: CommandJournal = None, history_limit: int = None):
+        self._history = deque(maxlen=history_limit)
+        self._journal = journal
     
     def execute_command(self, command: OrderCommand):
         command.execute()
         self._history.append(command)
+        if self._journal is not None:
+            for leaf, status in _leaf_results(command):
+                self._journal.append("execute", leaf.name, leaf.order.order_id, status)
     
     def undo_last(self):
         if self._history:
             command = self._history.pop()
-            command.undo()
\ No newline at end of file
+            command.undo()
+            if self._journal is not None:
+                for leaf, status in _leaf_results(command, undo=True):
+                    self._journal.append("undo", leaf.name, leaf.order.order_id, status)
\ No newline at end of file
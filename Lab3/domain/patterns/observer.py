@@ -1,54 +1,258 @@
+import copy
+import threading
 from abc import ABC, abstractmethod
-from typing import List
-from domain.models import Order, OrderStatus
+from contextlib import contextmanager
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+from domain.models import Order, OrderStatus, Product
+from domain.event_bus import AsyncDispatcher
+from domain.inventory import InsufficientStockError, ShardedInventory
+from domain.outbox import EmailOutbox
+
+Transition = Tuple[OrderStatus, OrderStatus]  # (from, to)
 
 class OrderObserver(ABC):
+    # Default subscription, used when attach() is not given one: None means every status
+    statuses: Optional[FrozenSet[OrderStatus]] = None
+    transitions: FrozenSet[Transition] = frozenset()
+
     @abstractmethod
     def update(self, order: Order):
         pass
 
+    def update_batch(self, orders: List[Order]):
+        for order in orders:
+            self.update(order)
+
 class OrderSubject:
-    def __init__(self):
-        self._observers: List[OrderObserver] = []
-    
-    def attach(self, observer: OrderObserver):
-        if observer not in self._observers:
-            self._observers.append(observer)
+    """Notifies only the observers subscribed to an event's status or (from, to) transition.
+
+    Targets come from a dispatch table keyed by status and by transition, each entry holding
+    the matching observers in attach order. attach/detach build a new table and swap it in,
+    so a dispatch in progress keeps using the table it started with.
+
+    Observers are called on the caller's thread, or through an AsyncDispatcher when one is
+    given; asynchronous observers receive a snapshot of the order taken at notify time, so a
+    status change made before delivery does not leak into earlier events.
+    """
+    def __init__(self, dispatcher: AsyncDispatcher = None):
+        self._subscriptions: Dict[OrderObserver, Tuple[FrozenSet[OrderStatus], FrozenSet[Transition]]] = {}
+        self._routes: Dict[object, Tuple[OrderObserver, ...]] = {status: () for status in OrderStatus}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._dispatcher = dispatcher
+
+    @staticmethod
+    def _matches(key, statuses: FrozenSet[OrderStatus], transitions: FrozenSet[Transition]) -> bool:
+        if isinstance(key, tuple):
+            return key[1] in statuses or key in transitions
+        return key in statuses
+
+    def attach(self, observer: OrderObserver, statuses: Iterable[OrderStatus] = None,
+               transitions: Iterable[Transition] = None):
+        """Subscribes to the given statuses and/or transitions, falling back to the observer's
+        own `statuses`/`transitions`. With neither, the observer receives every event."""
+        transitions = frozenset(observer.transitions if transitions is None else transitions)
+        statuses = observer.statuses if statuses is None else statuses
+        if statuses is None:
+            statuses = () if transitions else OrderStatus
+        statuses = frozenset(statuses)
+        with self._lock:
+            if observer in self._subscriptions:
+                return
+            self._subscriptions[observer] = (statuses, transitions)
+            routes = dict(self._routes)
+            for key, targets in routes.items():
+                if self._matches(key, statuses, transitions):
+                    routes[key] = targets + (observer,)
+            for transition in transitions - routes.keys():
+                routes[transition] = tuple(o for o, (st, tr) in self._subscriptions.items()
+                                           if self._matches(transition, st, tr))
+            self._routes = routes
+        if self._dispatcher is not None:
+            self._dispatcher.add(observer)
     
     def detach(self, observer: OrderObserver):
-        self._observers.remove(observer)
+        with self._lock:
+            if observer not in self._subscriptions:
+                raise ValueError(f"{observer!r} is not attached")
+            statuses, transitions = self._subscriptions.pop(observer)
+            routes = dict(self._routes)
+            for key, targets in routes.items():
+                if self._matches(key, statuses, transitions):
+                    routes[key] = tuple(o for o in targets if o is not observer)
+            self._routes = routes
+        if self._dispatcher is not None:
+            self._dispatcher.remove(observer)
     
-    def notify_observers(self, order: Order):
-        for observer in self._observers:
-            observer.update(order)
+    def _targets(self, order: Order, previous: Optional[OrderStatus]) -> Tuple[OrderObserver, ...]:
+        routes = self._routes
+        targets = routes.get((previous, order.status)) if previous is not None else None
+        if targets is None:
+            targets = routes.get(order.status, ())
+        return targets
+
+    @contextmanager
+    def batch(self):
+        """Holds back notifications made on this thread inside the block and sends them as one
+        batch when it ends; if the block raises, they are discarded. Nested blocks join the
+        outermost one.
+
+        Each change is recorded with the status it set. Orders still in that status when the
+        batch is sent are delivered as they are; only changes superseded by a later one inside
+        the block get a snapshot, so synchronous delivery of one change per order copies nothing.
+        If an observer raises while the batch is delivered, the error propagates from the block."""
+        if getattr(self._local, "pending", None) is not None:
+            yield
+            return
+        self._local.pending = pending = []
+        try:
+            yield
+        finally:
+            self._local.pending = None
+        changes = []
+        for order, status, previous in pending:
+            if order.status is not status:
+                order = copy.copy(order)
+                order.status = status
+            changes.append((order, previous))
+        self.notify_batch(changes)
+
+    def notify_batch(self, changes: List[Tuple[Order, Optional[OrderStatus]]]):
+        """Delivers many (order, previous status) changes, calling each observer's update_batch
+        once with all the orders it subscribes to, in the order the changes happened.
+        Asynchronous observers get snapshots, as with notify_observers."""
+        if self._dispatcher is not None:
+            changes = [(copy.copy(order), previous) for order, previous in changes]
+        per_observer: Dict[OrderObserver, List[Order]] = {}
+        for order, previous in changes:
+            for observer in self._targets(order, previous):
+                per_observer.setdefault(observer, []).append(order)
+        for observer, orders in per_observer.items():
+            if self._dispatcher is None:
+                observer.update_batch(orders)
+            else:
+                for order in orders:
+                    self._dispatcher.dispatch(observer, order)
+
+    def notify_observers(self, order: Order, previous: OrderStatus = None):
+        """`previous` is the status the order is leaving; without it only status subscriptions apply"""
+        pending = getattr(self._local, "pending", None)
+        if pending is not None:
+            pending.append((order, order.status, previous))
+            return
+        targets = self._targets(order, previous)
+        if self._dispatcher is None:
+            for observer in targets:
+                observer.update(order)
+            return
+        if targets:
+            snapshot = copy.copy(order)
+            for observer in targets:
+                self._dispatcher.dispatch(observer, snapshot)
 
 # Concrete Observers
 class EmailNotificationService(OrderObserver):
-    def update(self, order: Order):
-        print(f"[EMAIL] Order {order.order_id} status changed to {order.status.value}")
+    def __init__(self, outbox: EmailOutbox = None):
+        self.outbox = outbox  # without an outbox, notifications are printed inline
+
+    def _lines(self, order: Order) -> List[str]:
+        lines = [f"Order {order.order_id} status changed to {order.status.value}"]
         if order.status == OrderStatus.CONFIRMED:
-            print(f"[EMAIL] Order confirmed! Total: ${order.total_amount:.2f}")
+            lines.append(f"Order confirmed! Total: ${order.total_amount:.2f}")
         elif order.status == OrderStatus.SHIPPED:
-            print(f"[EMAIL] Your order has been shipped!")
+            lines.append(f"Your order has been shipped!")
+        return lines
+
+    def update(self, order: Order):
+        self.update_batch([order])
+
+    def update_batch(self, orders: List[Order]):
+        if self.outbox is not None:
+            for order in orders:
+                self.outbox.enqueue(order.order_id, order.status.value, self._lines(order))
+        elif orders:
+            print("\n".join(f"[EMAIL] {line}" for order in orders for line in self._lines(order)))
 
 class InventoryManagementService(OrderObserver):
-    def __init__(self):
-        self.processed_orders = set()  # Track which orders we've processed
+    """Reserves stock when an order is confirmed, settles it once shipped and gives it back
+    when the order is cancelled or its confirmation is undone.
+
+    Observers only hear about a confirmation after it happened, so update() and update_batch()
+    raise InsufficientStockError, and ConfirmOrderCommand or MacroCommand puts the orders back.
+    Give ConfirmOrderCommand the same inventory to reserve up front: a rejected order then never
+    becomes CONFIRMED, and this observer just reports the stock.
+    """
+    statuses = frozenset({OrderStatus.CONFIRMED, OrderStatus.SHIPPED, OrderStatus.CANCELLED})
+    transitions = frozenset({(OrderStatus.CONFIRMED, OrderStatus.PENDING)})
+
+    def __init__(self, inventory: ShardedInventory = None):
+        self.inventory = inventory or ShardedInventory()
     
     def update(self, order: Order):
-        # Only process inventory when order is FIRST confirmed (not when reverting)
-        if (order.status == OrderStatus.CONFIRMED and 
-            order.order_id not in self.processed_orders):
-            
-            print(f"[INVENTORY] Updating stock for order {order.order_id}")
-            for item in order.items:
-                item.product.stock -= item.quantity
-                print(f"[INVENTORY] Product {item.product.name} stock updated to {item.product.stock}")
-            
-            self.processed_orders.add(order.order_id)
+        if order.status == OrderStatus.CONFIRMED:
+            # Only reserve when the order is FIRST confirmed (not when reverting a shipment)
+            try:
+                reserved = self.inventory.reserve(order.order_id, order.items)
+            except InsufficientStockError as e:
+                print(f"[INVENTORY] Order {order.order_id} rejected: {e}")
+                raise
+            if reserved or self.inventory.is_reserved(order.order_id):
+                print(f"[INVENTORY] Updating stock for order {order.order_id}")
+                for item in order.items:
+                    print(f"[INVENTORY] Product {item.product.name} stock updated to {item.product.stock}")
+        elif order.status == OrderStatus.SHIPPED:
+            self.inventory.settle(order.order_id)
+        elif self.inventory.release(order.order_id):
+            print(f"[INVENTORY] Released stock for order {order.order_id}")
+
+    def update_batch(self, orders: List[Order]):
+        # runs of confirmations are reserved together; other changes apply one by one, in order.
+        # Rejections are raised once the whole batch is applied, so MacroCommand can roll it back.
+        lines: List[str] = []
+        rejected: List[InsufficientStockError] = []
+        run: List[Order] = []
+        for order in orders + [None]:
+            if order is not None and order.status == OrderStatus.CONFIRMED:
+                run.append(order)
+                continue
+            if run:
+                rejected += self._reserve_run(run, lines)
+                run = []
+            if order is None:
+                break
+            if order.status == OrderStatus.SHIPPED:
+                self.inventory.settle(order.order_id)
+            elif self.inventory.release(order.order_id):
+                lines.append(f"[INVENTORY] Released stock for order {order.order_id}")
+        if lines:
+            print("\n".join(lines))
+        if rejected:
+            raise rejected[0]
+
+    def _reserve_run(self, orders: List[Order], lines: List[str]) -> List[InsufficientStockError]:
+        results = self.inventory.reserve_many((order.order_id, order.items) for order in orders)
+        touched: Dict[str, Product] = {}
+        rejected = []
+        for order, result in zip(orders, results):
+            if isinstance(result, InsufficientStockError):
+                lines.append(f"[INVENTORY] Order {order.order_id} rejected: {result}")
+                rejected.append(result)
+            elif result or self.inventory.is_reserved(order.order_id):
+                lines.append(f"[INVENTORY] Updating stock for order {order.order_id}")
+                touched.update((item.product.id, item.product) for item in order.items)
+        for product in touched.values():
+            lines.append(f"[INVENTORY] Product {product.name} stock updated to {product.stock}")
+        return rejected
 
 class AnalyticsService(OrderObserver):
     def update(self, order: Order):
-        print(f"[ANALYTICS] Recording order {order.order_id} with status {order.status.value}")
-        if order.status == OrderStatus.DELIVERED:
-            print(f"[ANALYTICS] Order {order.order_id} completed successfully!")
\ No newline at end of file
+        self.update_batch([order])
+
+    def update_batch(self, orders: List[Order]):
+        lines = []
+        for order in orders:
+            lines.append(f"[ANALYTICS] Recording order {order.order_id} with status {order.status.value}")
+            if order.status == OrderStatus.DELIVERED:
+                lines.append(f"[ANALYTICS] Order {order.order_id} completed successfully!")
+        if lines:
+            print("\n".join(lines))
\ No newline at end of file
@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List, Sequence
 from domain.models import Order
 
 class DiscountStrategy(ABC):
@@ -6,27 +8,60 @@ class DiscountStrategy(ABC):
     def apply_discount(self, order: Order) -> float:
         pass
 
+    def apply_discount_batch(self, orders: Sequence[Order], totals: "np.ndarray") -> "np.ndarray":
+        """Final amounts for many orders at once; `totals` holds their undiscounted totals.
+        Strategies that only depend on the total override this with an array expression."""
+        import numpy as np
+        return np.fromiter((self.apply_discount(order) for order in orders), dtype=np.float64, count=len(orders))
+
 class NoDiscountStrategy(DiscountStrategy):
     def apply_discount(self, order: Order) -> float:
-        return order.calculate_total()
+        return order.total
+
+    def apply_discount_batch(self, orders, totals):
+        return totals.copy()
+
+    def __repr__(self):
+        return "NoDiscountStrategy()"
 
 class PercentageDiscountStrategy(DiscountStrategy):
     def __init__(self, percentage: float):
         self.percentage = percentage
     
     def apply_discount(self, order: Order) -> float:
-        total = order.calculate_total()
+        total = order.total
         discount = total * (self.percentage / 100)
         return total - discount
 
+    def apply_discount_batch(self, orders, totals):
+        return totals - totals * (self.percentage / 100)
+
+    def __repr__(self):
+        return f"PercentageDiscountStrategy({self.percentage})"
+
 class FixedAmountDiscountStrategy(DiscountStrategy):
     def __init__(self, amount: float):
         self.amount = amount
     
     def apply_discount(self, order: Order) -> float:
-        total = order.calculate_total()
+        total = order.total
         return max(0, total - self.amount)
 
+    def apply_discount_batch(self, orders, totals):
+        return (totals - self.amount).clip(min=0)
+
+    def __repr__(self):
+        return f"FixedAmountDiscountStrategy({self.amount})"
+
+@dataclass
+class DiscountComparison:
+    strategy: DiscountStrategy
+    final_amounts: "np.ndarray"  # one per order, in input order
+    revenue: float
+    discount: float  # given away compared to no discount
+    mean_final: float
+    orders_discounted: int
+
 class DiscountContext:
     def __init__(self, strategy: DiscountStrategy = None):
         self._strategy = strategy or NoDiscountStrategy()
@@ -35,4 +70,29 @@ class DiscountContext:
         self._strategy = strategy
     
     def calculate_final_amount(self, order: Order) -> float:
-        return self._strategy.apply_discount(order)
\ No newline at end of file
+        return self._strategy.apply_discount(order)
+
+    @staticmethod
+    def compare(strategies: Sequence[DiscountStrategy], orders: Sequence[Order]) -> List[DiscountComparison]:
+        """What-if evaluation of several strategies over the same orders.
+
+        Order totals are read once into an array and each strategy prices all orders in one array
+        expression; the amounts match calculate_final_amount order by order. Needs numpy.
+        """
+        import numpy as np
+        orders = list(orders)
+        totals = np.fromiter((order.total for order in orders), dtype=np.float64, count=len(orders))
+        undiscounted = float(totals.sum())
+        results = []
+        for strategy in strategies:
+            finals = np.asarray(strategy.apply_discount_batch(orders, totals), dtype=np.float64)
+            revenue = float(finals.sum())
+            results.append(DiscountComparison(
+                strategy=strategy,
+                final_amounts=finals,
+                revenue=revenue,
+                discount=undiscounted - revenue,
+                mean_final=revenue / len(orders) if orders else 0.0,
+                orders_discounted=int((finals < totals).sum()),
+            ))
+        return results
\ No newline at end of file
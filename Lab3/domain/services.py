@@ -1,3 +1,4 @@
+from domain.inventory import ShardedInventory
 from domain.patterns.observer import OrderSubject, EmailNotificationService, InventoryManagementService, AnalyticsService
 from domain.patterns.strategy import DiscountContext, PercentageDiscountStrategy, FixedAmountDiscountStrategy
 from domain.patterns.command import CommandInvoker, ConfirmOrderCommand, ShipOrderCommand, CancelOrderCommand
@@ -7,10 +8,11 @@ class OrderProcessingService:
     def __init__(self):
         self.order_subject = OrderSubject()
         self.command_invoker = CommandInvoker()
+        self.inventory = ShardedInventory()  # shared, so confirmations reserve before they happen
         
         # Attach observers
         self.order_subject.attach(EmailNotificationService())
-        self.order_subject.attach(InventoryManagementService())
+        self.order_subject.attach(InventoryManagementService(self.inventory))
         self.order_subject.attach(AnalyticsService())
     
     def create_sample_products(self):
@@ -48,7 +50,7 @@ class OrderProcessingService:
         
         # Command Pattern: Execute order workflow
         print("\n4. Executing order commands:")
-        confirm_cmd = ConfirmOrderCommand(order, self.order_subject)
+        confirm_cmd = ConfirmOrderCommand(order, self.order_subject, self.inventory)
         ship_cmd = ShipOrderCommand(order, self.order_subject)
         
         self.command_invoker.execute_command(confirm_cmd)